@@ -66,7 +66,7 @@ def profile_process_example(pid: int, duration: int = 10):
     result = collector.collect_process_profile(
         pid=pid,
         duration=duration,
-        frequency=99,
+        frequency=97,
         event="cpu-clock"
     )
     
@@ -96,12 +96,12 @@ def profile_process_example(pid: int, duration: int = 10):
     print(f"   Stack samples collected: {len(flame_data)}")
     
     if flame_data:
-        print(f"\n   Sample stack trace (first sample):")
+        print(f"\n   Sample stack trace (first sample, leaf first):")
         first_sample = flame_data[0]
         print(f"   Command: {first_sample.get('command', 'unknown')}")
         print(f"   Stack depth: {len(first_sample.get('stack', []))}")
         for frame in first_sample.get('stack', [])[:5]:
-            print(f"      ↓ {frame}")
+            print(f"      ↑ {frame}")
         if len(first_sample.get('stack', [])) > 5:
             print(f"      ... ({len(first_sample['stack']) - 5} more frames)")
     
@@ -113,19 +113,12 @@ def save_flame_graph_data(flame_data: list, output_file: str = "flame_data.txt")
     print_section("3. Saving Flame Graph Data")
     
     output_path = Path(output_file)
-    lines = []
-    
-    for sample in flame_data:
-        if sample.get('stack'):
-            command = sample.get('command', 'unknown')
-            stack_trace = ';'.join(sample['stack'])
-            lines.append(f"{command};{stack_trace} 1")
     
     with open(output_path, 'w') as f:
-        f.write('\n'.join(lines))
+        written = PerfCollector.write_collapsed_stacks(flame_data, f)
     
     print(f"✅ Flame graph data saved to: {output_path.absolute()}")
-    print(f"   Total stack traces: {len(lines)}")
+    print(f"   Total stack traces: {written}")
     print(f"\n💡 Generate flame graph using:")
     print(f"   cat {output_file} | flamegraph.pl > flame.svg")
     print(f"   # or upload to https://www.speedscope.app/")
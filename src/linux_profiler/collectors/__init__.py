@@ -1,12 +1,13 @@
 """Performance data collectors."""
 
+from .cached import CachedCollector
 from .cpu import CPUCollector
 from .disk import DiskCollector
 from .memory import MemoryCollector
 from .network import NetworkCollector
 from .perf import PerfCollector
 from .process import ProcessCollector
-from .utils import bytes_to_human
+from .utils import bytes_to_human, dumps_json
 
 __all__ = [
     "CPUCollector",
@@ -15,5 +16,7 @@ __all__ = [
     "NetworkCollector",
     "ProcessCollector",
     "PerfCollector",
+    "CachedCollector",
     "bytes_to_human",
+    "dumps_json",
 ]
@@ -0,0 +1,67 @@
+"""Time-based caching wrapper for collectors."""
+
+import threading
+import time
+from typing import Any
+
+from .base import BaseCollector
+
+
+class CachedCollector(BaseCollector):
+    """Serve a collector's latest result until it is older than a TTL.
+
+    Clients that poll several tools in quick succession (e.g. a summary
+    followed by get_all_metrics) then share one /proc read per collector
+    instead of re-parsing the same files for each call.
+    """
+
+    def __init__(self, collector: BaseCollector, ttl: float = 0.5):
+        """Wrap a collector.
+
+        Args:
+            collector: Collector whose collect() takes no arguments.
+            ttl: Maximum result age in seconds; 0 disables caching.
+        """
+        self.collector = collector
+        self.ttl = ttl
+        # (result, monotonic time it was collected), replaced as a whole so
+        # lock-free readers never see a result paired with another's timestamp
+        self._entry: tuple[dict[str, Any], float] | None = None
+        # Held while collecting; callers that find the entry expired at the
+        # same time wait for one collect instead of each running their own
+        self._lock = threading.Lock()
+
+    def _fresh(self) -> dict[str, Any] | None:
+        """Return the cached result if it is younger than the TTL."""
+        entry = self._entry
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+        return None
+
+    def collect(self) -> dict[str, Any]:
+        """Return the cached result, refreshing it once it has expired.
+
+        The returned dictionary is shared between callers and must not be
+        modified.
+        """
+        value = self._fresh()
+        if value is not None:
+            return value
+        with self._lock:
+            value = self._fresh()
+            if value is not None:
+                return value  # refreshed by another thread while we waited
+            return self._refresh_locked()
+
+    def refresh(self) -> dict[str, Any]:
+        """Collect a new result regardless of the cached one's age."""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> dict[str, Any]:
+        value = self.collector.collect()
+        self._entry = (value, time.monotonic())
+        return value
+
+    def get_description(self) -> str:
+        return self.collector.get_description()
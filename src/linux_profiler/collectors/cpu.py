@@ -1,47 +1,124 @@
 """CPU performance collector."""
 
+import os
 import psutil
+import threading
 from typing import Any
 
 from .base import BaseCollector
+from .procfs import open_proc_file, parse_cpu_times, parse_cpuinfo_mhz
+
+# Field positions in a parse_cpu_times() row
+_USER, _NICE, _SYSTEM, _IDLE, _IOWAIT, _IRQ, _SOFTIRQ, _STEAL = range(8)
+
+
+def _usage_percent(prev: tuple[int, ...], cur: tuple[int, ...]) -> tuple[float, list[float]]:
+    """Compute busy percent and per-field percents between two /proc/stat rows.
+
+    Guest time is already included in user/nice, so it is left out of the
+    total, matching psutil.
+    """
+    deltas = [max(c - p, 0) for p, c in zip(prev[:8], cur[:8])]
+    total = sum(deltas)
+    if not total:
+        return 0.0, [0.0] * 8
+    busy = total - deltas[_IDLE] - deltas[_IOWAIT]
+    return busy / total * 100, [d / total * 100 for d in deltas]
 
 
 class CPUCollector(BaseCollector):
     """Collector for CPU performance metrics."""
 
+    def __init__(self):
+        """Initialize with the CPU properties that do not change at runtime."""
+        self._cpu_count = psutil.cpu_count()
+        self._cpu_count_logical = psutil.cpu_count(logical=True)
+        # Per-core (min_mhz, max_mhz) limits are static hardware properties
+        self._freq_limits = [
+            (round(freq.min, 2) if freq.min else None, round(freq.max, 2) if freq.max else None)
+            for freq in psutil.cpu_freq(percpu=True) or []
+        ]
+        # Serializes the /proc/stat read with the baseline swap, so concurrent
+        # collects cannot store an older sample over a newer one
+        self._usage_lock = threading.Lock()
+        # Prime the usage baselines so collect() never has to sleep
+        self._stat_file = open_proc_file("/proc/stat")
+        if self._stat_file is not None:
+            self._prev_cpu_times = parse_cpu_times(self._stat_file.read())
+        else:
+            psutil.cpu_percent(interval=None, percpu=True)
+            psutil.cpu_times_percent(interval=None)
+        self._cpuinfo_file = open_proc_file("/proc/cpuinfo")
+
+    def _collect_usage(self) -> tuple[list[float], dict[str, float]]:
+        """Return per-core usage percents and the overall time distribution."""
+        if self._stat_file is None:
+            cpu_percent = psutil.cpu_percent(interval=None, percpu=True)
+            cpu_times = psutil.cpu_times_percent(interval=None)
+            return cpu_percent, {
+                "user": cpu_times.user,
+                "system": cpu_times.system,
+                "idle": cpu_times.idle,
+                "iowait": getattr(cpu_times, 'iowait', 0),
+                "irq": getattr(cpu_times, 'irq', 0),
+                "softirq": getattr(cpu_times, 'softirq', 0),
+            }
+
+        with self._usage_lock:
+            cur = parse_cpu_times(self._stat_file.read())
+            prev, self._prev_cpu_times = self._prev_cpu_times, cur
+
+        cpu_percent = [_usage_percent(p, c)[0] for p, c in zip(prev[1:], cur[1:])]
+        _, fields = _usage_percent(prev[0], cur[0])
+        return cpu_percent, {
+            "user": fields[_USER],
+            "system": fields[_SYSTEM],
+            "idle": fields[_IDLE],
+            "iowait": fields[_IOWAIT],
+            "irq": fields[_IRQ],
+            "softirq": fields[_SOFTIRQ],
+        }
+
+    def _collect_frequencies(self) -> list[float]:
+        """Return the current frequency of each core in MHz."""
+        if self._cpuinfo_file is not None:
+            current = parse_cpuinfo_mhz(self._cpuinfo_file.read())
+            # psutil reports these same values whenever there is one per core,
+            # but also globs and re-reads the cpufreq sysfs files on every call
+            if current and len(current) == len(self._freq_limits):
+                return current
+        return [freq.current for freq in psutil.cpu_freq(percpu=True) or []]
+
     def collect(self) -> dict[str, Any]:
-        """Collect CPU metrics including usage, frequency, and load average."""
-        cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
-        cpu_freq = psutil.cpu_freq(percpu=True)
-        cpu_times = psutil.cpu_times_percent(interval=0)
-        load_avg = psutil.getloadavg()
-        cpu_count = psutil.cpu_count()
-        cpu_count_logical = psutil.cpu_count(logical=True)
+        """Collect CPU metrics including usage, frequency, and load average.
+
+        Usage and time distribution are non-blocking: they cover the period
+        since the previous call (or since construction), so the caller's
+        polling cadence sets the sampling window.
+        """
+        cpu_percent, cpu_times = self._collect_usage()
+        cpu_freq = self._collect_frequencies()
+        load_avg = os.getloadavg()
 
         freq_info = []
-        if cpu_freq:
-            for i, freq in enumerate(cpu_freq):
-                freq_info.append({
-                    "core": i,
-                    "current_mhz": round(freq.current, 2),
-                    "min_mhz": round(freq.min, 2) if freq.min else None,
-                    "max_mhz": round(freq.max, 2) if freq.max else None,
-                })
+        for i, current_mhz in enumerate(cpu_freq):
+            min_mhz, max_mhz = (
+                self._freq_limits[i] if i < len(self._freq_limits) else (None, None)
+            )
+            freq_info.append({
+                "core": i,
+                "current_mhz": round(current_mhz, 2),
+                "min_mhz": min_mhz,
+                "max_mhz": max_mhz,
+            })
 
         return {
             "overall_percent": round(sum(cpu_percent) / len(cpu_percent), 2),
             "per_core_percent": [round(p, 2) for p in cpu_percent],
-            "core_count_physical": cpu_count,
-            "core_count_logical": cpu_count_logical,
+            "core_count_physical": self._cpu_count,
+            "core_count_logical": self._cpu_count_logical,
             "frequency": freq_info,
-            "times": {
-                "user": round(cpu_times.user, 2),
-                "system": round(cpu_times.system, 2),
-                "idle": round(cpu_times.idle, 2),
-                "iowait": round(getattr(cpu_times, 'iowait', 0), 2),
-                "irq": round(getattr(cpu_times, 'irq', 0), 2),
-                "softirq": round(getattr(cpu_times, 'softirq', 0), 2),
-            },
+            "times": {name: round(value, 2) for name, value in cpu_times.items()},
             "load_average": {
                 "1min": round(load_avg[0], 2),
                 "5min": round(load_avg[1], 2),
@@ -1,21 +1,58 @@
 """Disk I/O performance collector."""
 
 import psutil
+import time
 from typing import Any
 
 from .base import BaseCollector
+from .procfs import open_proc_file, parse_diskstats
 from .utils import bytes_to_human
 
+# Seconds to reuse the mounted partition list; mounts rarely change
+PARTITIONS_TTL = 60.0
+
+# Seconds to reuse a mountpoint's disk_usage() (statvfs) result
+DISK_USAGE_TTL = 5.0
+
 
 class DiskCollector(BaseCollector):
     """Collector for disk I/O performance metrics."""
 
+    def __init__(self):
+        """Open /proc/diskstats once for repeated sampling."""
+        self._diskstats_file = open_proc_file("/proc/diskstats")
+        self._partitions: list[Any] = []
+        self._partitions_ts = float("-inf")
+        # mountpoint -> (disk_usage result, monotonic time it was taken)
+        self._usage_cache: dict[str, tuple[Any, float]] = {}
+
+    def _get_partitions(self, now: float) -> list[Any]:
+        """Return the mounted partitions, refreshed every PARTITIONS_TTL seconds."""
+        if now - self._partitions_ts > PARTITIONS_TTL:
+            self._partitions = psutil.disk_partitions(all=False)
+            self._partitions_ts = now
+            # Drop usage entries for filesystems that are no longer mounted
+            mountpoints = {partition.mountpoint for partition in self._partitions}
+            for mountpoint in self._usage_cache.keys() - mountpoints:
+                del self._usage_cache[mountpoint]
+        return self._partitions
+
+    def _get_usage(self, mountpoint: str, now: float) -> Any:
+        """Return disk_usage() for a mountpoint, reused for DISK_USAGE_TTL seconds."""
+        cached = self._usage_cache.get(mountpoint)
+        if cached is not None and now - cached[1] <= DISK_USAGE_TTL:
+            return cached[0]
+        usage = psutil.disk_usage(mountpoint)
+        self._usage_cache[mountpoint] = (usage, now)
+        return usage
+
     def collect(self) -> dict[str, Any]:
         """Collect disk usage and I/O statistics."""
+        now = time.monotonic()
         partitions = []
-        for partition in psutil.disk_partitions(all=False):
+        for partition in self._get_partitions(now):
             try:
-                usage = psutil.disk_usage(partition.mountpoint)
+                usage = self._get_usage(partition.mountpoint, now)
                 partitions.append({
                     "device": partition.device,
                     "mountpoint": partition.mountpoint,
@@ -32,21 +69,29 @@ class DiskCollector(BaseCollector):
             except (PermissionError, OSError):
                 continue
 
-        io_counters = psutil.disk_io_counters(perdisk=True)
+        if self._diskstats_file is not None:
+            io_counters = parse_diskstats(self._diskstats_file.read())
+        else:
+            io_counters = {
+                disk_name: (c.read_count, c.write_count, c.read_bytes, c.write_bytes,
+                            c.read_time, c.write_time, getattr(c, 'busy_time', None))
+                for disk_name, c in (psutil.disk_io_counters(perdisk=True) or {}).items()
+            }
+
         io_stats = {}
-        if io_counters:
-            for disk_name, counters in io_counters.items():
-                io_stats[disk_name] = {
-                    "read_count": counters.read_count,
-                    "write_count": counters.write_count,
-                    "read_bytes": counters.read_bytes,
-                    "read_human": bytes_to_human(counters.read_bytes),
-                    "write_bytes": counters.write_bytes,
-                    "write_human": bytes_to_human(counters.write_bytes),
-                    "read_time_ms": counters.read_time,
-                    "write_time_ms": counters.write_time,
-                    "busy_time_ms": getattr(counters, 'busy_time', None),
-                }
+        for disk_name, (read_count, write_count, read_bytes, write_bytes,
+                        read_time, write_time, busy_time) in io_counters.items():
+            io_stats[disk_name] = {
+                "read_count": read_count,
+                "write_count": write_count,
+                "read_bytes": read_bytes,
+                "read_human": bytes_to_human(read_bytes),
+                "write_bytes": write_bytes,
+                "write_human": bytes_to_human(write_bytes),
+                "read_time_ms": read_time,
+                "write_time_ms": write_time,
+                "busy_time_ms": busy_time,
+            }
 
         return {
             "partitions": partitions,
@@ -1,19 +1,68 @@
 """Memory performance collector."""
 
+import os
 import psutil
+from types import SimpleNamespace
 from typing import Any
 
 from .base import BaseCollector
+from .procfs import open_proc_file, parse_meminfo, parse_vmstat
 from .utils import bytes_to_human
 
 
 class MemoryCollector(BaseCollector):
     """Collector for memory performance metrics."""
 
+    def __init__(self):
+        """Open /proc/meminfo and /proc/vmstat once for repeated sampling."""
+        self._meminfo_file = open_proc_file("/proc/meminfo")
+        self._vmstat_file = open_proc_file("/proc/vmstat")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+
+    def _read_procfs(self) -> tuple[SimpleNamespace, SimpleNamespace]:
+        """Build psutil-compatible virtual/swap records from /proc/meminfo and /proc/vmstat."""
+        mem = parse_meminfo(self._meminfo_file.read())
+        total = mem.get(b"MemTotal", 0)
+        free = mem.get(b"MemFree", 0)
+        buffers = mem.get(b"Buffers", 0)
+        # Reclaimable slab counts as cache, like free(1) and psutil
+        cached = mem.get(b"Cached", 0) + mem.get(b"SReclaimable", 0)
+        available = mem.get(b"MemAvailable", free + buffers + cached)
+        if available > total:
+            # Distorted values inside some containers
+            available = free
+        virtual = SimpleNamespace(
+            total=total,
+            available=available,
+            used=total - available,
+            free=free,
+            percent=round((total - available) / total * 100, 1) if total else 0.0,
+            buffers=buffers,
+            cached=cached,
+            shared=mem.get(b"Shmem", 0),
+        )
+
+        swap_total = mem.get(b"SwapTotal", 0)
+        swap_free = mem.get(b"SwapFree", 0)
+        swap_used = swap_total - swap_free
+        vmstat = parse_vmstat(self._vmstat_file.read()) if self._vmstat_file else {}
+        swap = SimpleNamespace(
+            total=swap_total,
+            used=swap_used,
+            free=swap_free,
+            percent=round(swap_used / swap_total * 100, 1) if swap_total else 0.0,
+            sin=vmstat.get(b"pswpin", 0) * self._page_size,
+            sout=vmstat.get(b"pswpout", 0) * self._page_size,
+        )
+        return virtual, swap
+
     def collect(self) -> dict[str, Any]:
         """Collect memory and swap usage metrics."""
-        virtual = psutil.virtual_memory()
-        swap = psutil.swap_memory()
+        if self._meminfo_file is not None:
+            virtual, swap = self._read_procfs()
+        else:
+            virtual = psutil.virtual_memory()
+            swap = psutil.swap_memory()
 
         return {
             "virtual": {
@@ -1,32 +1,79 @@
 """Network performance collector."""
 
 import psutil
+from collections import Counter
 from typing import Any
 
 from .base import BaseCollector
+from .procfs import count_socket_states, open_proc_file, parse_net_dev
 from .utils import bytes_to_human
 
+# /proc/net socket tables covering psutil's kind='inet'
+_INET_SOCKET_TABLES = ("tcp", "tcp6", "udp", "udp6")
+
+# TCP state codes from include/net/tcp_states.h, as they appear in /proc/net/tcp
+_TCP_STATE_CODES = {
+    b"01": "ESTABLISHED",
+    b"0A": "LISTEN",
+    b"06": "TIME_WAIT",
+    b"08": "CLOSE_WAIT",
+}
+
 
 class NetworkCollector(BaseCollector):
     """Collector for network performance metrics."""
 
+    def __init__(self):
+        """Open /proc/net/dev and the socket tables once for repeated sampling."""
+        self._net_dev_file = open_proc_file("/proc/net/dev")
+        # Tables for disabled protocols (e.g. no IPv6) are simply skipped
+        self._socket_files = {
+            name: proc_file
+            for name in _INET_SOCKET_TABLES
+            if (proc_file := open_proc_file(f"/proc/net/{name}")) is not None
+        }
+
+    def _connection_states(self) -> tuple[int, Counter[str]]:
+        """Return the total inet socket count and TCP sockets per state name."""
+        if "tcp" not in self._socket_files:
+            connections = psutil.net_connections(kind='inet')
+            return len(connections), Counter(c.status for c in connections)
+
+        total = 0
+        states: Counter[str] = Counter()
+        for name, proc_file in self._socket_files.items():
+            counts = count_socket_states(proc_file.read())
+            total += counts.total()
+            if name.startswith("tcp"):
+                for code, state in _TCP_STATE_CODES.items():
+                    states[state] += counts[code]
+        return total, states
+
     def collect(self) -> dict[str, Any]:
         """Collect network I/O and connection statistics."""
-        io_counters = psutil.net_io_counters(pernic=True)
+        if self._net_dev_file is not None:
+            io_counters = parse_net_dev(self._net_dev_file.read())
+        else:
+            io_counters = {
+                nic_name: (c.bytes_recv, c.packets_recv, c.errin, c.dropin,
+                           c.bytes_sent, c.packets_sent, c.errout, c.dropout)
+                for nic_name, c in psutil.net_io_counters(pernic=True).items()
+            }
+
         interfaces = {}
-        
-        for nic_name, counters in io_counters.items():
+        for nic_name, (bytes_recv, packets_recv, errin, dropin,
+                       bytes_sent, packets_sent, errout, dropout) in io_counters.items():
             interfaces[nic_name] = {
-                "bytes_sent": counters.bytes_sent,
-                "bytes_sent_human": bytes_to_human(counters.bytes_sent),
-                "bytes_recv": counters.bytes_recv,
-                "bytes_recv_human": bytes_to_human(counters.bytes_recv),
-                "packets_sent": counters.packets_sent,
-                "packets_recv": counters.packets_recv,
-                "errin": counters.errin,
-                "errout": counters.errout,
-                "dropin": counters.dropin,
-                "dropout": counters.dropout,
+                "bytes_sent": bytes_sent,
+                "bytes_sent_human": bytes_to_human(bytes_sent),
+                "bytes_recv": bytes_recv,
+                "bytes_recv_human": bytes_to_human(bytes_recv),
+                "packets_sent": packets_sent,
+                "packets_recv": packets_recv,
+                "errin": errin,
+                "errout": errout,
+                "dropin": dropin,
+                "dropout": dropout,
             }
 
         # Get network addresses
@@ -44,13 +91,13 @@ class NetworkCollector(BaseCollector):
 
         # Get connection statistics
         try:
-            connections = psutil.net_connections(kind='inet')
+            total, states = self._connection_states()
             conn_stats = {
-                "total": len(connections),
-                "established": sum(1 for c in connections if c.status == 'ESTABLISHED'),
-                "listen": sum(1 for c in connections if c.status == 'LISTEN'),
-                "time_wait": sum(1 for c in connections if c.status == 'TIME_WAIT'),
-                "close_wait": sum(1 for c in connections if c.status == 'CLOSE_WAIT'),
+                "total": total,
+                "established": states["ESTABLISHED"],
+                "listen": states["LISTEN"],
+                "time_wait": states["TIME_WAIT"],
+                "close_wait": states["CLOSE_WAIT"],
             }
         except psutil.AccessDenied:
             conn_stats = {"error": "Access denied - requires root privileges"}
@@ -1,21 +1,119 @@
 """Performance profiling collector using perf."""
 
+import asyncio
+import contextlib
+import itertools
 import os
+import re
+import signal
 import subprocess
 import tempfile
+import threading
 import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Literal
 
 from .base import BaseCollector
 
+# Maximum number of raw perf script bytes returned alongside the parsed samples
+RAW_STACK_TRACES_LIMIT = 10000
+
+# Sampling frequency presets (Hz) selectable via the ``mode`` argument
+PROFILE_MODE_FREQUENCIES = {
+    "light": 47,
+    "normal": 97,
+    "deep": 997,
+}
+
+# Ring buffer size in bytes for overwrite (flight-recorder) mode
+OVERWRITE_MMAP_SIZE = 8 << 20
+
+# Per-CPU ring buffer size in bytes in low-overhead mode: fewer wakeups to
+# drain it. This is locked memory, so it stays well below the sizes that
+# would pin gigabytes on many-core hosts
+LOW_OVERHEAD_MMAP_SIZE = 16 << 20
+
+# Where the kernel's perf_event_paranoid and perf_event_mlock_kb settings live
+PERF_SYSCTL_DIR = "/proc/sys/kernel"
+
+# Expected sample count (duration * frequency * cores) above which we suggest mode="light"
+SAMPLE_BUDGET_WARNING = 100_000
+
+# Output fields requested from `perf script`: a fixed, compact layout without
+# per-frame symbol offsets, so frames of the same function collapse together
+SCRIPT_FIELDS = "comm,pid,time,ip,sym,dso"
+
+# perf script errors for a -F selection that this perf does not know
+_SCRIPT_FIELDS_UNKNOWN = b"unknown switch `F'"
+
+# perf script errors for -F fields that a recording lacks, e.g. "Samples for
+# 'cpu-clock' event do not have IP attribute set. Cannot print 'ip' field."
+_SCRIPT_FIELDS_REJECTED = (
+    b"Invalid field requested",
+    b"Invalid event type in field string",
+    b"Cannot print '",
+    _SCRIPT_FIELDS_UNKNOWN,
+)
+
+# One callchain frame of `perf script` output: "\t    7f12ab34 symbol (dso)"
+_FRAME_RE = re.compile(rb'^\s+[0-9a-f]+\s+(.+?)\s+\(')
+
+# One entry of `perf report -F overhead,comm,symbol` output, matched across the whole report.
+# A comm may contain spaces ("kworker/0:1 H", "Web Content"), so it runs up to the [.]/[k] column.
+_REPORT_LINE_RE = re.compile(
+    rb'^[ \t]*(\d+\.\d+)%[ \t]+(\S.*?)[ \t]+\[.\][ \t]+(\S.*?)[ \t\r]*$', re.MULTILINE
+)
+
+
+def _mlock_limit(sysctl_dir: str = PERF_SYSCTL_DIR) -> int | None:
+    """Return the largest per-CPU ring buffer perf record may lock, or None if unlimited.
+
+    Unless the caller is privileged (root) or perf_event_paranoid is -1, the
+    kernel rejects ring buffers over perf_event_mlock_kb per CPU, less one
+    header page, with EPERM.
+    """
+    if os.geteuid() == 0:
+        return None
+    try:
+        with open(os.path.join(sysctl_dir, "perf_event_paranoid"), "rb") as paranoid_file:
+            if int(paranoid_file.read()) <= -1:
+                return None
+        with open(os.path.join(sysctl_dir, "perf_event_mlock_kb"), "rb") as mlock_file:
+            mlock_kb = int(mlock_file.read())
+    except (OSError, ValueError):
+        return None
+    return mlock_kb * 1024 - os.sysconf("SC_PAGE_SIZE")
+
+
+@dataclass
+class _ProfileRun:
+    """Scratch state shared by the recording and analysis phases of a profile."""
+
+    temp_dir: str
+    collapsed_file: IO[str] | None
+    flame_graph_data: list[dict[str, Any]] = field(default_factory=list)
+    raw_head: bytearray = field(default_factory=bytearray)
+    parsed_snapshots: set[Path] = field(default_factory=set)
+
+    @property
+    def perf_data_file(self) -> Path:
+        return Path(self.temp_dir) / "perf.data"
+
+    @property
+    def record_err_file(self) -> Path:
+        return Path(self.temp_dir) / "perf-record.err"
+
 
 class PerfCollector(BaseCollector):
     """Collector for perf-based performance profiling."""
 
     def __init__(self):
-        """Initialize perf collector."""
-        self._check_perf_available()
+        """Initialize perf collector and probe for the perf tool once."""
+        self._perf_available = self._check_perf_available()
+        # Cleared if this perf does not support the -F option at all
+        self._script_fields_supported = True
 
     def _check_perf_available(self) -> bool:
         """Check if perf tool is available on the system."""
@@ -38,211 +136,582 @@ class PerfCollector(BaseCollector):
         self,
         pid: int,
         duration: int = 10,
-        frequency: int = 99,
-        event: str = "cpu-clock"
+        frequency: int | None = None,
+        event: str = "cpu-clock",
+        mode: Literal["light", "normal", "deep"] = "normal",
+        overwrite: bool = False,
+        switch_output_event: str | None = None,
+        collapsed_output: str | None = None,
+        low_overhead: bool = True
     ) -> dict[str, Any]:
         """
         Collect performance profile for a specific process using perf.
 
+        The mode presets all use prime frequencies (47/97/997 Hz), which avoid
+        sampling in lockstep with periodic activity in the target, as
+        recommended by Brendan Gregg. Perf overhead, perf.data size and parse
+        time all grow linearly with frequency, so prefer "light" for long
+        runs or processes with many busy threads.
+
         Args:
             pid: Process ID to profile
             duration: Duration in seconds to collect data (default: 10)
-            frequency: Sampling frequency in Hz (default: 99)
+            frequency: Sampling frequency in Hz; overrides the mode preset
             event: Perf event to record (default: cpu-clock)
+            mode: Sampling preset: "light" (47 Hz), "normal" (97 Hz) or "deep" (997 Hz)
+            overwrite: Record into a fixed-size ring buffer that keeps only the
+                newest samples instead of the whole run
+            switch_output_event: Perf event that dumps the ring buffer to a new
+                perf.data snapshot each time it fires (e.g. a tracepoint)
+            collapsed_output: Path to write collapsed stacks ("cmd;f1;f2 1") to
+                while parsing, for flamegraph.pl; flame_graph_data is then
+                left empty instead of holding every sample in memory
+            low_overhead: Use a larger ring buffer (as far as the locked
+                memory limit of unprivileged users allows) and skip the
+                build-id scan of every mapped DSO after recording; disable
+                when symbols must be resolved by build-id, e.g. on another machine
 
         Returns:
             Dictionary containing profiling data and flame graph information
         """
-        if not self._check_perf_available():
-            return {
-                "success": False,
-                "error": "perf tool is not available on this system",
-                "help": "Install perf with: apt-get install linux-tools-generic (Ubuntu/Debian) or yum install perf (RHEL/CentOS)"
-            }
-
-        # Check if process exists
-        try:
-            os.kill(pid, 0)  # Signal 0 just checks if process exists
-        except ProcessLookupError:
-            return {
-                "success": False,
-                "error": f"Process with PID {pid} does not exist"
-            }
-        except PermissionError:
-            return {
-                "success": False,
-                "error": f"Permission denied to access process {pid}"
-            }
+        error, frequency, command = self._prepare_profile(pid, frequency, mode)
+        if error:
+            return error
+        meta = {
+            "pid": pid,
+            "command": command,
+            "duration": duration,
+            "frequency": frequency,
+            "event": event,
+            "mode": mode,
+        }
 
         # Create temporary directory for perf data
-        with tempfile.TemporaryDirectory() as temp_dir:
-            perf_data_file = Path(temp_dir) / "perf.data"
+        with tempfile.TemporaryDirectory() as temp_dir, (
+            open(collapsed_output, "w") if collapsed_output else contextlib.nullcontext()
+        ) as collapsed_file:
+            run = _ProfileRun(temp_dir, collapsed_file)
+            record_cmd = self._record_command(
+                run, pid, duration, frequency, event, overwrite, switch_output_event, low_overhead
+            )
             
             # Record perf data
             try:
-                record_cmd = [
-                    "perf", "record",
-                    "-F", str(frequency),
-                    "-p", str(pid),
-                    "-g",  # Enable call-graph (stack trace) recording
-                    "-e", event,
-                    "-o", str(perf_data_file),
-                    "--", "sleep", str(duration)
-                ]
+                with open(run.record_err_file, "wb") as record_err_fh:
+                    record_proc = subprocess.Popen(
+                        record_cmd,
+                        stdout=subprocess.DEVNULL,
+                        stderr=record_err_fh
+                    )
                 
-                record_result = subprocess.run(
-                    record_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=duration + 10
-                )
+                deadline = time.monotonic() + duration + 10
+                while True:
+                    try:
+                        returncode = record_proc.wait(timeout=1)
+                        break
+                    except subprocess.TimeoutExpired:
+                        if time.monotonic() > deadline:
+                            record_proc.kill()
+                            record_proc.wait()
+                            return self._record_timeout_error(duration)
+                    # Parse snapshots rotated out so far while recording continues
+                    error = self._parse_snapshots(run, self._rotated_snapshots(temp_dir))
+                    if error:
+                        record_proc.kill()
+                        record_proc.wait()
+                        return error
                 
-                if record_result.returncode != 0:
-                    return {
-                        "success": False,
-                        "error": f"perf record failed: {record_result.stderr}",
-                        "command": " ".join(record_cmd)
-                    }
+                if returncode != 0:
+                    return self._record_failed_error(run, record_cmd)
                 
-            except subprocess.TimeoutExpired:
-                return {
-                    "success": False,
-                    "error": f"perf record timed out after {duration + 10} seconds"
-                }
             except Exception as e:
                 return {
                     "success": False,
                     "error": f"Failed to run perf record: {str(e)}"
                 }
 
-            # Parse perf data to get stack traces
+            return self._finish_profile(run, meta, collapsed_output)
+
+    async def collect_process_profile_async(
+        self,
+        pid: int,
+        duration: int = 10,
+        frequency: int | None = None,
+        event: str = "cpu-clock",
+        mode: Literal["light", "normal", "deep"] = "normal",
+        overwrite: bool = False,
+        switch_output_event: str | None = None,
+        collapsed_output: str | None = None,
+        low_overhead: bool = True
+    ) -> dict[str, Any]:
+        """
+        Asynchronous variant of collect_process_profile().
+
+        perf record runs as an asyncio subprocess, so the recording period is
+        awaited on the event loop instead of holding a worker thread for the
+        whole duration. Parsing and reporting still block and run in worker
+        threads. If the task is cancelled, perf record is killed.
+
+        Args:
+            See collect_process_profile().
+
+        Returns:
+            Dictionary containing profiling data and flame graph information
+        """
+        error, frequency, command = self._prepare_profile(pid, frequency, mode)
+        if error:
+            return error
+        meta = {
+            "pid": pid,
+            "command": command,
+            "duration": duration,
+            "frequency": frequency,
+            "event": event,
+            "mode": mode,
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir, (
+            open(collapsed_output, "w") if collapsed_output else contextlib.nullcontext()
+        ) as collapsed_file:
+            run = _ProfileRun(temp_dir, collapsed_file)
+            record_cmd = self._record_command(
+                run, pid, duration, frequency, event, overwrite, switch_output_event, low_overhead
+            )
+
+            record_proc = None
             try:
-                script_cmd = [
-                    "perf", "script",
-                    "-i", str(perf_data_file)
-                ]
+                with open(run.record_err_file, "wb") as record_err_fh:
+                    record_proc = await asyncio.create_subprocess_exec(
+                        *record_cmd,
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=record_err_fh
+                    )
                 
-                script_result = subprocess.run(
-                    script_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                if script_result.returncode != 0:
-                    return {
-                        "success": False,
-                        "error": f"perf script failed: {script_result.stderr}"
-                    }
+                deadline = time.monotonic() + duration + 10
+                while True:
+                    try:
+                        returncode = await asyncio.wait_for(record_proc.wait(), timeout=1)
+                        break
+                    except asyncio.TimeoutError:
+                        if time.monotonic() > deadline:
+                            return self._record_timeout_error(duration)
+                    # Parse snapshots rotated out so far while recording continues
+                    error = await asyncio.to_thread(
+                        self._parse_snapshots, run, self._rotated_snapshots(temp_dir)
+                    )
+                    if error:
+                        return error
                 
-                stack_traces = script_result.stdout
+                if returncode != 0:
+                    return self._record_failed_error(run, record_cmd)
                 
-            except subprocess.TimeoutExpired:
-                return {
-                    "success": False,
-                    "error": "perf script timed out"
-                }
             except Exception as e:
                 return {
                     "success": False,
-                    "error": f"Failed to parse perf data: {str(e)}"
+                    "error": f"Failed to run perf record: {str(e)}"
                 }
+            finally:
+                # Timed out, failed to parse or cancelled: do not leave perf running
+                if record_proc is not None and record_proc.returncode is None:
+                    record_proc.kill()
+                    await record_proc.wait()
 
-            # Get report summary
-            try:
-                report_cmd = [
-                    "perf", "report",
-                    "-i", str(perf_data_file),
-                    "--stdio",
-                    "--no-children"
-                ]
-                
-                report_result = subprocess.run(
-                    report_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
+            return await asyncio.to_thread(self._finish_profile, run, meta, collapsed_output)
+
+    def _prepare_profile(
+        self,
+        pid: int,
+        frequency: int | None,
+        mode: str
+    ) -> tuple[dict[str, Any] | None, int, str]:
+        """
+        Validate profile arguments and look up the target process.
+
+        Returns:
+            (error dictionary or None, sampling frequency, target command name)
+        """
+        if mode not in PROFILE_MODE_FREQUENCIES:
+            return {
+                "success": False,
+                "error": f"Unknown mode: {mode}. Use one of: {', '.join(PROFILE_MODE_FREQUENCIES)}"
+            }, 0, ""
+        if frequency is None:
+            frequency = PROFILE_MODE_FREQUENCIES[mode]
+
+        if not self._perf_available:
+            return {
+                "success": False,
+                "error": "perf tool is not available on this system",
+                "help": "Install perf with: apt-get install linux-tools-generic (Ubuntu/Debian) or yum install perf (RHEL/CentOS)"
+            }, frequency, ""
+
+        # Check if process exists, reading its command name from the same /proc entry.
+        # comm is world-readable; opening environ (without reading it) makes the
+        # kernel check ptrace read access, which perf needs to attach to the process.
+        try:
+            with open(f"/proc/{pid}/comm", "rb") as comm_file:
+                command = comm_file.read().strip().decode(errors="replace")
+            os.close(os.open(f"/proc/{pid}/environ", os.O_RDONLY))
+        except (FileNotFoundError, ProcessLookupError):
+            return {
+                "success": False,
+                "error": f"Process with PID {pid} does not exist"
+            }, frequency, ""
+        except PermissionError:
+            return {
+                "success": False,
+                "error": f"Permission denied to access process {pid}"
+            }, frequency, ""
+
+        return None, frequency, command
+
+    @staticmethod
+    def _record_command(
+        run: "_ProfileRun",
+        pid: int,
+        duration: int,
+        frequency: int,
+        event: str,
+        overwrite: bool,
+        switch_output_event: str | None,
+        low_overhead: bool
+    ) -> list[str]:
+        """Build the perf record command line for a profile run."""
+        record_cmd = [
+            "perf", "record",
+            "-F", str(frequency),
+            "-p", str(pid),
+            "-g",  # Enable call-graph (stack trace) recording
+            "-e", event,
+            "-o", str(run.perf_data_file),
+        ]
+        mmap_size = None
+        if overwrite:
+            # Flight-recorder mode: keep only the newest samples in a fixed ring buffer
+            record_cmd += ["--overwrite"]
+            mmap_size = OVERWRITE_MMAP_SIZE
+        elif low_overhead:
+            mmap_size = LOW_OVERHEAD_MMAP_SIZE
+        if mmap_size is not None:
+            limit = _mlock_limit()
+            # Over the limit, perf's default is the largest buffer the limit allows
+            if limit is None or mmap_size <= limit:
+                record_cmd += ["-m", f"{mmap_size >> 20}M"]
+        if low_overhead:
+            # Symbols are resolved on this host right away, so build-ids are not needed
+            record_cmd += ["--no-buildid", "--no-buildid-cache"]
+        if switch_output_event:
+            # Dump the ring buffer to perf.data.<timestamp> each time the event fires
+            record_cmd += ["--switch-output-event", switch_output_event]
+        record_cmd += ["--", "sleep", str(duration)]
+        return record_cmd
+
+    @staticmethod
+    def _record_timeout_error(duration: int) -> dict[str, Any]:
+        """Error result for a perf record that outlived its deadline."""
+        return {
+            "success": False,
+            "error": f"perf record timed out after {duration + 10} seconds"
+        }
+
+    @staticmethod
+    def _record_failed_error(run: "_ProfileRun", record_cmd: list[str]) -> dict[str, Any]:
+        """Error result for a perf record that exited with a failure status."""
+        return {
+            "success": False,
+            "error": f"perf record failed: {run.record_err_file.read_bytes().decode(errors='replace')}",
+            "command": " ".join(record_cmd)
+        }
+
+    def _parse_snapshots(self, run: "_ProfileRun", snapshots: list[Path]) -> dict[str, Any] | None:
+        """
+        Parse the given data files that this run has not parsed yet.
+
+        Returns:
+            None on success, or an error dictionary
+        """
+        for snapshot in snapshots:
+            if snapshot not in run.parsed_snapshots:
+                run.parsed_snapshots.add(snapshot)
+                error = self._script_samples(
+                    snapshot, run.temp_dir, run.flame_graph_data, run.raw_head, run.collapsed_file
                 )
-                
-                report_summary = report_result.stdout if report_result.returncode == 0 else ""
-                
-            except Exception:
-                report_summary = ""
+                if error:
+                    return error
+        return None
 
-            # Parse stack traces for flame graph format
-            flame_graph_data = self._parse_to_flame_graph_format(stack_traces)
+    def _finish_profile(
+        self,
+        run: "_ProfileRun",
+        meta: dict[str, Any],
+        collapsed_output: str | None
+    ) -> dict[str, Any]:
+        """
+        Parse what is left of a finished recording and build the result.
+
+        Args:
+            run: State of the profile run
+            meta: Profile parameters echoed at the start of the result
+            collapsed_output: Collapsed stack output path, if any
+
+        Returns:
+            Dictionary containing profiling data and flame graph information
+        """
+        # Parse the remaining snapshots, or the single perf.data without rotation
+        snapshots = self._rotated_snapshots(run.temp_dir) or [run.perf_data_file]
+        error = self._parse_snapshots(run, snapshots)
+        if error:
+            return error
+
+        # Summarize the most recent data file
+        perf_data_file = snapshots[-1]
+
+        # Get report summary
+        try:
+            report_cmd = [
+                "perf", "report",
+                "-i", str(perf_data_file),
+                "--stdio",
+                "--no-children",
+                "-F", "overhead,comm,symbol",
+                "--percent-limit", "0.1",
+                "-s", "symbol"
+            ]
+
+            report_result = subprocess.run(
+                report_cmd,
+                capture_output=True,
+                timeout=30
+            )
+
+            report_summary = report_result.stdout if report_result.returncode == 0 else b""
             
-            # Get statistics
-            stats = self._extract_statistics(report_summary)
+        except Exception:
+            report_summary = b""
+
+        # Get statistics
+        stats = self._extract_statistics(report_summary)
 
+        result = {
+            "success": True,
+            **meta,
+            "snapshots": len(run.parsed_snapshots),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "statistics": stats,
+            "flame_graph_data": run.flame_graph_data,
+            "collapsed_output": collapsed_output,
+            "raw_stack_traces": run.raw_head.decode(errors="replace"),  # Limit size
+            "report_summary": report_summary[:5000].decode(errors="replace"),  # Limit size
+            "help": "Use flame_graph_data to generate flame graph visualization"
+        }
+
+        # Surface the sampling overhead when the profile is likely to be heavy
+        duration, frequency = meta["duration"], meta["frequency"]
+        num_cores = os.cpu_count() or 1
+        expected_samples = duration * frequency * num_cores
+        if expected_samples > SAMPLE_BUDGET_WARNING:
+            result["warning"] = (
+                f"Up to {expected_samples} samples expected ({duration}s x {frequency} Hz x "
+                f"{num_cores} CPUs); consider mode=\"light\" to reduce overhead"
+            )
+
+        return result
+
+    @staticmethod
+    def _rotated_snapshots(temp_dir: str) -> list[Path]:
+        """List perf.data.<timestamp> files written by --switch-output, oldest first."""
+        return sorted(Path(temp_dir).glob("perf.data.*"))
+
+    def _script_samples(
+        self,
+        perf_data_file: Path,
+        temp_dir: str,
+        samples: list[dict[str, Any]],
+        raw_head: bytearray,
+        out_file: IO[str] | None = None,
+        script_fields: bool = True
+    ) -> dict[str, Any] | None:
+        """
+        Stream `perf script` output for one data file into the parser.
+
+        Args:
+            perf_data_file: perf.data file to decode
+            temp_dir: Scratch directory for perf script stderr
+            samples: List the parsed stack samples are appended to
+            raw_head: Buffer receiving the first raw output bytes
+            out_file: If given, write collapsed stacks here instead of
+                appending to ``samples``
+            script_fields: Request the SCRIPT_FIELDS layout where perf supports it
+
+        Returns:
+            None on success, or an error dictionary
+        """
+        try:
+            script_cmd = [
+                "perf", "script",
+                "-i", str(perf_data_file)
+            ]
+            use_fields = script_fields and self._script_fields_supported
+            if use_fields:
+                script_cmd += ["-F", SCRIPT_FIELDS]
+
+            stderr_file = Path(temp_dir) / "perf-script.err"
+            with open(stderr_file, "wb") as stderr_fh:
+                script_proc = subprocess.Popen(
+                    script_cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_fh,
+                    bufsize=1 << 20
+                )
+
+            # Kill perf script if it runs longer than 30 s
+            watchdog = threading.Timer(30, script_proc.kill)
+            watchdog.start()
+            try:
+                parsed = self._iter_flame_graph_samples(
+                    self._tee_head(script_proc.stdout, raw_head, RAW_STACK_TRACES_LIMIT)
+                )
+                if out_file is not None:
+                    self.write_collapsed_stacks(parsed, out_file)
+                else:
+                    samples.extend(parsed)
+                script_proc.stdout.close()
+                returncode = script_proc.wait()
+            finally:
+                watchdog.cancel()
+
+            if returncode == -signal.SIGKILL:
+                return {
+                    "success": False,
+                    "error": "perf script timed out"
+                }
+
+            if returncode != 0:
+                stderr = stderr_file.read_bytes()
+                if (use_fields and not raw_head
+                        and any(message in stderr for message in _SCRIPT_FIELDS_REJECTED)):
+                    # Older perf or a recording without the requested fields:
+                    # fall back to the default output layout
+                    if _SCRIPT_FIELDS_UNKNOWN in stderr:
+                        self._script_fields_supported = False
+                    return self._script_samples(
+                        perf_data_file, temp_dir, samples, raw_head, out_file, script_fields=False
+                    )
+                return {
+                    "success": False,
+                    "error": f"perf script failed: {stderr.decode(errors='replace')}"
+                }
+
+        except Exception as e:
             return {
-                "success": True,
-                "pid": pid,
-                "duration": duration,
-                "frequency": frequency,
-                "event": event,
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "statistics": stats,
-                "flame_graph_data": flame_graph_data,
-                "raw_stack_traces": stack_traces[:10000] if len(stack_traces) > 10000 else stack_traces,  # Limit size
-                "report_summary": report_summary[:5000] if len(report_summary) > 5000 else report_summary,  # Limit size
-                "help": "Use flame_graph_data to generate flame graph visualization"
+                "success": False,
+                "error": f"Failed to parse perf data: {str(e)}"
             }
 
-    def _parse_to_flame_graph_format(self, stack_traces: str) -> list[dict[str, Any]]:
+        return None
+
+    @staticmethod
+    def write_collapsed_stacks(samples: Iterable[dict[str, Any]], out_file: IO[str]) -> int:
         """
-        Parse perf script output to flame graph format.
+        Write samples in the collapsed stack format used by flamegraph.pl.
+
+        Each sample becomes one ``command;root;...;leaf 1`` line; sample
+        stacks are stored leaf first, so they are written in reverse.
+
+        Args:
+            samples: Stack samples as produced in flame_graph_data
+            out_file: Text file to write to
 
         Returns:
-            List of stack samples in format suitable for flame graph generation
+            Number of stacks written
+        """
+        written = 0
+        for sample in samples:
+            if sample.get("stack"):
+                stack = ';'.join(reversed(sample['stack']))
+                out_file.write(f"{sample.get('command', 'unknown')};{stack} 1\n")
+                written += 1
+        return written
+
+    @staticmethod
+    def _tee_head(lines: Iterable[bytes], head: bytearray, limit: int) -> Iterator[bytes]:
+        """Pass lines through unchanged while copying the first ``limit`` bytes into ``head``."""
+        for line in lines:
+            if len(head) < limit:
+                head += line[:limit - len(head)]
+            yield line
+
+    def _iter_flame_graph_samples(self, lines: Iterable[bytes]) -> Iterator[dict[str, Any]]:
+        """
+        Incrementally parse perf script output lines into stack samples.
+
+        Lines are consumed as raw bytes and each sample is yielded as soon as
+        its terminating blank line is seen, so only one sample is held in
+        memory at a time. Only sample headers and frame symbols are decoded,
+        and each distinct symbol is decoded once and shared by every sample
+        that contains it.
+
+        Args:
+            lines: Iterable of raw perf script output lines (e.g. a pipe)
+
+        Yields:
+            Stack samples in format suitable for flame graph generation
         """
-        samples = []
         current_sample = None
         current_stack = []
+        symtab: dict[bytes, str] = {}
         
-        for line in stack_traces.split('\n'):
-            line = line.strip()
-            
-            if not line:
+        for line in lines:
+            if line.isspace():
                 # End of current sample
                 if current_sample and current_stack:
-                    samples.append({
+                    yield {
                         "command": current_sample.get("command", ""),
                         "pid": current_sample.get("pid", 0),
                         "timestamp": current_sample.get("timestamp", ""),
-                        "stack": list(reversed(current_stack))  # Reverse for flame graph (root at bottom)
-                    })
+                        "stack": current_stack  # Leaf first, as perf prints it
+                    }
                 current_sample = None
                 current_stack = []
                 continue
             
-            # Sample header line (e.g., "python 12345 [000] 123456.789: cpu-clock:")
-            if not line.startswith('\t') and ':' in line:
-                parts = line.split()
-                if len(parts) >= 4:
+            # Stack frame line (indented, format: "address function (module)")
+            if line[:1] in (b'\t', b' '):
+                match = _FRAME_RE.match(line)
+                if match is None:
+                    continue
+                symbol = match.group(1)
+                # Share one str per distinct symbol across all samples
+                name = symtab.get(symbol)
+                if name is None:
+                    name = symtab[symbol] = symbol.decode(errors="replace")
+                current_stack.append(name)
+            # Sample header line, either "python 12345 123456.789:" (SCRIPT_FIELDS)
+            # or the default "python 12345 [000] 123456.789: cpu-clock:"
+            elif b':' in line:
+                parts = line.decode(errors="replace").split()
+                if len(parts) >= 3:
                     current_sample = {
                         "command": parts[0],
                         "pid": int(parts[1]) if parts[1].isdigit() else 0,
-                        "timestamp": parts[3] if len(parts) > 3 else ""
+                        "timestamp": next((part for part in parts[2:] if part.endswith(':')), "")
                     }
-            # Stack frame line (starts with tab)
-            elif line.startswith('\t'):
-                # Remove leading whitespace and address
-                frame = line.strip()
-                # Extract function name (format: "address function (module)")
-                if '(' in frame:
-                    func_part = frame.split('(')[0].strip()
-                    # Remove address part
-                    parts = func_part.split(maxsplit=1)
-                    if len(parts) > 1:
-                        current_stack.append(parts[1])
-                    else:
-                        current_stack.append(func_part)
         
-        return samples
+        # Flush a trailing sample not followed by a blank line
+        if current_sample and current_stack:
+            yield {
+                "command": current_sample.get("command", ""),
+                "pid": current_sample.get("pid", 0),
+                "timestamp": current_sample.get("timestamp", ""),
+                "stack": current_stack
+            }
+
+    def _extract_statistics(self, report_summary: bytes) -> dict[str, Any]:
+        """Extract key statistics from perf report.
 
-    def _extract_statistics(self, report_summary: str) -> dict[str, Any]:
-        """Extract key statistics from perf report."""
+        Expects the fixed ``-F overhead,comm,symbol`` field layout, where each
+        entry line looks like ``12.34%  python  [.] function_name``.
+        """
         top_functions: list[dict[str, Any]] = []
         stats: dict[str, Any] = {
             "total_samples": 0,
@@ -252,36 +721,14 @@ class PerfCollector(BaseCollector):
         if not report_summary:
             return stats
         
-        # Parse report to extract top functions
-        in_overhead_section = False
-        for line in report_summary.split('\n'):
-            line = line.strip()
-            
-            # Look for overhead section
-            if 'Overhead' in line and 'Command' in line:
-                in_overhead_section = True
-                continue
-            
-            if in_overhead_section and line:
-                # Try to parse overhead line (e.g., "12.34%  python  [.] function_name")
-                parts = line.split()
-                if len(parts) >= 3 and '%' in parts[0]:
-                    try:
-                        overhead = float(parts[0].rstrip('%'))
-                        command = parts[1]
-                        # Function name is usually after symbol type [.]
-                        func_name = ' '.join(parts[3:]) if len(parts) > 3 else parts[2]
-                        
-                        top_functions.append({
-                            "overhead_percent": overhead,
-                            "command": command,
-                            "function": func_name
-                        })
-                        
-                        if len(top_functions) >= 20:  # Limit to top 20
-                            break
-                    except (ValueError, IndexError):
-                        continue
+        # Limit to top 20
+        for match in itertools.islice(_REPORT_LINE_RE.finditer(report_summary), 20):
+            overhead, command, func_name = match.groups()
+            top_functions.append({
+                "overhead_percent": float(overhead),
+                "command": command.decode(errors="replace"),
+                "function": func_name.decode(errors="replace")
+            })
         
         stats["total_samples"] = len(top_functions)
         
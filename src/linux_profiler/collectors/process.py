@@ -1,11 +1,117 @@
 """Process performance collector."""
 
+import functools
+import heapq
+import os
 import psutil
+import pwd
+import re
+import resource
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
 from typing import Any
 
 from .base import BaseCollector
+from .procfs import ProcFile, parse_pid_stat, read_proc_bytes
 from .utils import bytes_to_human
 
+# Process state letters from /proc/<pid>/stat, named as psutil reports them
+_PROC_STATUSES = {
+    b"R": "running",
+    b"S": "sleeping",
+    b"D": "disk-sleep",
+    b"T": "stopped",
+    b"t": "tracing-stop",
+    b"Z": "zombie",
+    b"X": "dead",
+    b"x": "dead",
+    b"K": "wake-kill",
+    b"W": "waking",
+    b"I": "idle",
+    b"P": "parked",
+}
+
+# psutil errors for a process that exited or cannot be inspected
+_PROC_GONE = (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+
+# process_iter attributes for the non-Linux collect() fallback and for search_processes()
+_PROC_ATTRS = ('pid', 'name', 'uids', 'cpu_times', 'memory_info', 'status',
+               'create_time', 'num_threads')
+# 'uids' shares the /proc/<pid>/status read with 'status' inside process_iter's oneshot()
+_SEARCH_ATTRS = ('pid', 'name', 'cmdline', 'cpu_percent', 'memory_percent', 'status', 'uids')
+
+# Longest process name the kernel keeps in /proc/<pid>/stat (TASK_COMM_LEN - 1)
+_COMM_MAX_LEN = 15
+
+# Upper bound on /proc/<pid>/stat descriptors kept open between collects;
+# also capped to a quarter of the RLIMIT_NOFILE soft limit
+STAT_FD_CACHE_LIMIT = 4096
+
+# One row per process: (pid, start_key, name, username, status, cpu_seconds,
+# rss_bytes, vms_bytes, num_threads). start_key tells apart processes that
+# reuse a pid; username is None when it is resolved after selection.
+_ProcRow = tuple[int, float, str, str | None, str, float, int, int, int]
+
+
+@functools.lru_cache(maxsize=256)
+def _uid_to_name(uid: int) -> str:
+    """Resolve a uid to a user name the way psutil does, once per uid."""
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@functools.lru_cache(maxsize=256)
+def _keyword_matcher(keyword: str, case_sensitive: bool) -> Callable[[str], re.Match | None]:
+    """Return a literal substring matcher for a search keyword, compiled once."""
+    return re.compile(re.escape(keyword), 0 if case_sensitive else re.IGNORECASE).search
+
+
+def _join_bounded(parts: list[str], limit: int) -> str:
+    """Return ``' '.join(parts)[:limit]`` without joining past the limit."""
+    out = []
+    length = -1
+    for part in parts:
+        out.append(part)
+        length += len(part) + 1
+        if length >= limit:
+            break
+    return ' '.join(out)[:limit]
+
+
+@dataclass(slots=True)
+class ProcRecord:
+    """Per-process figures kept while selecting the top consumers."""
+
+    pid: int
+    name: str
+    username: str | None
+    cpu_percent: float
+    memory_percent: float
+    memory_rss_bytes: int
+    memory_vms_bytes: int
+    status: str
+    num_threads: int
+
+    def to_dict(self) -> dict[str, Any]:
+        """Render the record as reported by ProcessCollector.collect()."""
+        return {
+            "pid": self.pid,
+            "name": self.name,
+            "username": self.username,
+            "cpu_percent": self.cpu_percent,
+            "memory_percent": self.memory_percent,
+            "memory_rss_bytes": self.memory_rss_bytes,
+            "memory_rss_human": bytes_to_human(self.memory_rss_bytes),
+            "memory_vms_bytes": self.memory_vms_bytes,
+            "status": self.status,
+            "num_threads": self.num_threads,
+        }
+
 
 class ProcessCollector(BaseCollector):
     """Collector for process performance metrics."""
@@ -17,51 +123,226 @@ class ProcessCollector(BaseCollector):
             top_n: Number of top processes to include in results.
         """
         self.top_n = top_n
+        self._total_memory = psutil.virtual_memory().total
+        # collect() swaps the CPU baselines and the cached stat descriptors,
+        # so concurrent calls take turns rather than closing each other's files
+        self._collect_lock = threading.Lock()
+        # (pid, start_key) -> (user + system CPU seconds, monotonic time) at the last collect
+        self._prev_cpu: dict[tuple[int, float], tuple[float, float]] = {}
+        # Read /proc directly on Linux; psutil.process_iter elsewhere
+        self._procfs = os.path.exists("/proc/self/stat")
+        if self._procfs:
+            self._clock_ticks = os.sysconf("SC_CLK_TCK")
+            self._page_size = os.sysconf("SC_PAGE_SIZE")
+            # pid -> open /proc/<pid>/stat, re-read with one pread() per collect
+            self._stat_files: dict[str, ProcFile] = {}
+            soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+            if soft_limit == resource.RLIM_INFINITY:
+                soft_limit = STAT_FD_CACHE_LIMIT * 4
+            self._stat_fd_limit = min(STAT_FD_CACHE_LIMIT, soft_limit // 4)
 
-    def collect(self) -> dict[str, Any]:
-        """Collect process statistics and top resource consumers."""
-        processes = []
-        
-        for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 
-                                          'memory_percent', 'memory_info', 'status',
-                                          'create_time', 'num_threads']):
+    def _iter_procfs(self) -> Iterator[_ProcRow]:
+        """Yield process rows with one /proc/<pid>/stat read per process.
+
+        Stat files stay open across calls, so a process seen before costs a
+        single pread() instead of an open/read/close triple. A descriptor
+        whose process has exited fails with ESRCH, even if the pid has since
+        been reused, and is then reopened for the new process.
+        """
+        clock_ticks = self._clock_ticks
+        page_size = self._page_size
+        old_files = self._stat_files
+        self._stat_files = stat_files = {}
+        with os.scandir("/proc") as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.isdigit():
+                    continue
+                stat_file = old_files.get(name)
+                try:
+                    data = None
+                    if stat_file is not None:
+                        try:
+                            data = stat_file.read_small()
+                        except OSError:
+                            stat_file.close()
+                            stat_file = None
+                    if data is None:
+                        path = f"/proc/{name}/stat"
+                        if len(stat_files) < self._stat_fd_limit:
+                            stat_file = ProcFile(path)
+                            data = stat_file.read_small()
+                        else:
+                            data = read_proc_bytes(path)
+                    (comm, state, utime, stime, num_threads, starttime,
+                     vsize, rss) = parse_pid_stat(data)
+                except (OSError, ValueError, IndexError):
+                    continue  # exited while scanning
+                if stat_file is not None:
+                    stat_files[name] = stat_file
+                yield (
+                    int(name),
+                    starttime,
+                    comm.decode(errors="replace"),
+                    None,
+                    _PROC_STATUSES.get(state, state.decode(errors="replace")),
+                    (utime + stime) / clock_ticks,
+                    rss * page_size,
+                    vsize,
+                    num_threads,
+                )
+        # Release descriptors of processes that are gone
+        for name, stat_file in old_files.items():
+            if stat_files.get(name) is not stat_file:
+                stat_file.close()
+
+    def _iter_psutil(self) -> Iterator[_ProcRow]:
+        """Yield process rows via psutil.process_iter."""
+        for proc in psutil.process_iter(_PROC_ATTRS):
             try:
                 info = proc.info
                 mem_info = info.get('memory_info')
-                processes.append({
-                    "pid": info['pid'],
-                    "name": info['name'],
-                    "username": info['username'],
-                    "cpu_percent": round(info['cpu_percent'] or 0, 2),
-                    "memory_percent": round(info['memory_percent'] or 0, 2),
-                    "memory_rss_bytes": mem_info.rss if mem_info else 0,
-                    "memory_rss_human": bytes_to_human(mem_info.rss) if mem_info else "0 B",
-                    "memory_vms_bytes": mem_info.vms if mem_info else 0,
-                    "status": info['status'],
-                    "num_threads": info['num_threads'],
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                cpu_times = info.get('cpu_times')
+                uids = info.get('uids')
+                yield (
+                    info['pid'],
+                    info['create_time'],
+                    info['name'],
+                    _uid_to_name(uids.real) if uids else None,
+                    info['status'],
+                    cpu_times.user + cpu_times.system if cpu_times else 0.0,
+                    mem_info.rss if mem_info else 0,
+                    mem_info.vms if mem_info else 0,
+                    info['num_threads'],
+                )
+            except _PROC_GONE:
                 continue
 
-        # Sort by CPU usage
-        top_cpu = sorted(processes, key=lambda x: x['cpu_percent'], reverse=True)[:self.top_n]
+    @staticmethod
+    def _procfs_username(pid: int) -> str | None:
+        """Resolve the owner of a process from the real uid in /proc/<pid>/status."""
+        try:
+            status = read_proc_bytes(f"/proc/{pid}/status")
+            uid = int(status[status.index(b"\nUid:") + 5:].split(None, 1)[0])
+        except (OSError, ValueError):
+            return None
+        return _uid_to_name(uid)
+
+    @staticmethod
+    def _procfs_full_name(pid: int, name: str) -> str:
+        """Expand a name the kernel cut to 15 characters, the way psutil does.
+
+        The basename of argv[0] from /proc/<pid>/cmdline is used when it
+        starts with the truncated name (e.g. "gnome-keyring-daemon" for
+        "gnome-keyring-d"); otherwise the truncated name is kept.
+        """
+        try:
+            cmdline = read_proc_bytes(f"/proc/{pid}/cmdline")
+        except OSError:
+            return name
+        if cmdline.endswith(b"\0"):
+            cmdline = cmdline[:-1]
+        # Processes that rewrite their title may separate arguments with spaces
+        argv0 = cmdline.split(b"\0" if b"\0" in cmdline else b" ", 1)[0]
+        full_name = os.path.basename(argv0.decode(errors="replace"))
+        return full_name if full_name.startswith(name) else name
+
+    def collect(self, top_n: int | None = None) -> dict[str, Any]:
+        """Collect process statistics and top resource consumers.
+
+        Processes are visited once: the status histogram and the bounded
+        top-N heaps are updated as each process is read, so only the top
+        entries are kept rather than a record for every process.
+
+        CPU percent covers the period since the previous call, as with
+        psutil's cpu_percent(); it is 0.0 for processes seen for the first time.
+
+        Args:
+            top_n: Number of top processes to include; defaults to the value
+                given at construction.
+        """
+        if top_n is None:
+            top_n = self.top_n
+        with self._collect_lock:
+            return self._collect(top_n)
+
+    def _collect(self, top_n: int) -> dict[str, Any]:
+        """Body of collect(); called with the collect lock held."""
+        now = time.monotonic()
+        prev_cpu = self._prev_cpu
+        self._prev_cpu = cur_cpu = {}
+        total_count = 0
+        status_counts: Counter[str] = Counter()
+        # Min-heaps of (value, -seen_index, record); the index breaks ties in
+        # favour of earlier processes and keeps records from being compared
+        cpu_heap: list[tuple[float, int, ProcRecord]] = []
+        memory_heap: list[tuple[float, int, ProcRecord]] = []
         
-        # Sort by memory usage
-        top_memory = sorted(processes, key=lambda x: x['memory_percent'], reverse=True)[:self.top_n]
+        rows = self._iter_procfs() if self._procfs else self._iter_psutil()
+        for pid, start_key, name, username, status, cpu_total, rss, vms, num_threads in rows:
+            key = (pid, start_key)
+            cur_cpu[key] = (cpu_total, now)
+            prev = prev_cpu.get(key)
+            cpu_percent = 0.0
+            if prev is not None and now > prev[1]:
+                cpu_percent = max(cpu_total - prev[0], 0.0) / (now - prev[1]) * 100
+            cpu_percent = round(cpu_percent, 2)
+            memory_percent = round(rss / self._total_memory * 100, 2)
+            status_counts[status] += 1
+            index = -total_count
+            total_count += 1
 
-        # Process status summary
-        status_counts = {}
-        for proc in processes:
-            status = proc['status']
-            status_counts[status] = status_counts.get(status, 0) + 1
+            # Later processes lose ties, so a full heap only admits strictly
+            # larger values; most processes are rejected on two float compares
+            # without building a record
+            takes_cpu = len(cpu_heap) < top_n or (top_n > 0 and cpu_percent > cpu_heap[0][0])
+            takes_memory = (len(memory_heap) < top_n
+                            or (top_n > 0 and memory_percent > memory_heap[0][0]))
+            if not (takes_cpu or takes_memory):
+                continue
+
+            record = ProcRecord(
+                pid,
+                name,
+                username,
+                cpu_percent,
+                memory_percent,
+                rss,
+                vms,
+                status,
+                num_threads,
+            )
+            if takes_cpu:
+                self._push_top(cpu_heap, (cpu_percent, index, record), top_n)
+            if takes_memory:
+                self._push_top(memory_heap, (memory_percent, index, record), top_n)
+
+        top_cpu = [entry[2] for entry in sorted(cpu_heap, reverse=True)]
+        top_memory = [entry[2] for entry in sorted(memory_heap, reverse=True)]
+        # Owner lookups, full names and formatting are done only for the reported processes
+        if self._procfs:
+            for record in top_cpu + top_memory:
+                if record.username is None:
+                    record.username = self._procfs_username(record.pid)
+                if len(record.name) == _COMM_MAX_LEN:
+                    record.name = self._procfs_full_name(record.pid, record.name)
 
         return {
-            "total_count": len(processes),
-            "status_summary": status_counts,
-            "top_cpu_consumers": top_cpu,
-            "top_memory_consumers": top_memory,
+            "total_count": total_count,
+            "status_summary": dict(status_counts),
+            "top_cpu_consumers": [record.to_dict() for record in top_cpu],
+            "top_memory_consumers": [record.to_dict() for record in top_memory],
         }
 
+    @staticmethod
+    def _push_top(heap: list[tuple[float, int, ProcRecord]],
+                  entry: tuple[float, int, ProcRecord], limit: int) -> None:
+        """Add an entry to a min-heap holding at most ``limit`` of the largest entries."""
+        if len(heap) < limit:
+            heapq.heappush(heap, entry)
+        elif heap and entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
     def search_processes(self, keyword: str, case_sensitive: bool = False) -> dict[str, Any]:
         """
         Search for processes by name or command line keyword.
@@ -81,34 +362,31 @@ class ProcessCollector(BaseCollector):
                 "processes": []
             }
         
-        search_keyword = keyword if case_sensitive else keyword.lower()
+        search = _keyword_matcher(keyword, case_sensitive)
+        # A keyword with a space may span the name and the command line
+        spans_fields = " " in keyword
         matched_processes = []
         
-        for proc in psutil.process_iter(['pid', 'name', 'username', 'cmdline', 
-                                          'cpu_percent', 'memory_percent', 'status']):
+        for proc in psutil.process_iter(_SEARCH_ATTRS):
             try:
                 info = proc.info
-                proc_name = info['name']
-                cmdline = ' '.join(info['cmdline']) if info['cmdline'] else ''
-                
-                # Prepare search text
-                if case_sensitive:
-                    search_text = f"{proc_name} {cmdline}"
-                else:
-                    search_text = f"{proc_name} {cmdline}".lower()
+                proc_name = info['name'] or ''
+                args = info['cmdline'] or []
                 
-                # Check if keyword matches
-                if search_keyword in search_text:
+                # Check if keyword matches, searching each argument rather than
+                # lowercased copies of the whole command line
+                if (search(proc_name) or any(map(search, args))
+                        or (spans_fields and search(f"{proc_name} {' '.join(args)}"))):
                     matched_processes.append({
                         "pid": info['pid'],
-                        "name": proc_name,
-                        "username": info['username'],
-                        "cmdline": cmdline[:200] if len(cmdline) > 200 else cmdline,  # Limit length
+                        "name": info['name'],
+                        "username": _uid_to_name(info['uids'].real) if info['uids'] else None,
+                        "cmdline": _join_bounded(args, 200),  # Limit length
                         "cpu_percent": round(info['cpu_percent'] or 0, 2),
                         "memory_percent": round(info['memory_percent'] or 0, 2),
                         "status": info['status'],
                     })
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            except _PROC_GONE:
                 continue
         
         # Sort by CPU usage
@@ -0,0 +1,231 @@
+"""Direct /proc readers used by the collectors on Linux."""
+
+import os
+from collections import Counter
+
+# Chunk size for pread(); large enough to get most /proc files in one call
+READ_CHUNK_SIZE = 65536
+
+# /proc/diskstats reports sectors in fixed 512-byte units regardless of the device
+DISKSTATS_SECTOR_SIZE = 512
+
+
+class ProcFile:
+    """A /proc file kept open and re-read from offset 0 with pread().
+
+    Keeping the descriptor open avoids an open()/close() pair and the path
+    lookup on every sample; /proc regenerates the content on each read.
+    """
+
+    def __init__(self, path: str):
+        """Open the file.
+
+        Args:
+            path: Absolute path of the /proc file.
+
+        Raises:
+            OSError: If the file cannot be opened.
+        """
+        self.path = path
+        self._fd = -1  # for __del__ if the open fails
+        self._fd = os.open(path, os.O_RDONLY)
+
+    def read(self) -> bytes:
+        """Read the current content of the file."""
+        chunks = []
+        offset = 0
+        while True:
+            chunk = os.pread(self._fd, READ_CHUNK_SIZE, offset)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+        return b"".join(chunks)
+
+    def read_small(self, size: int = 4096) -> bytes:
+        """Read a file known to fit in ``size`` bytes with a single pread()."""
+        return os.pread(self._fd, size, 0)
+
+    def close(self) -> None:
+        """Close the underlying file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self):
+        self.close()
+
+
+def open_proc_file(path: str) -> ProcFile | None:
+    """Open a /proc file, or return None where it is unavailable (e.g. macOS)."""
+    try:
+        return ProcFile(path)
+    except OSError:
+        return None
+
+
+def read_proc_bytes(path: str, size: int = 4096) -> bytes:
+    """Read a small /proc file with a single open/read/close.
+
+    Raises:
+        OSError: If the file cannot be read (e.g. the process has exited).
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def parse_pid_stat(data: bytes) -> tuple[bytes, bytes, int, int, int, int, int, int]:
+    """Parse /proc/<pid>/stat.
+
+    The command name is located via the last ")" since it may itself
+    contain spaces or parentheses.
+
+    Returns:
+        (comm, state, utime_ticks, stime_ticks, num_threads, starttime_ticks,
+        vsize_bytes, rss_pages)
+    """
+    open_paren = data.index(b"(")
+    close_paren = data.rindex(b")")
+    # fields[0] is stat field 3 (state), so stat field N is fields[N - 3]
+    fields = data[close_paren + 2 :].split(b" ")
+    return (
+        data[open_paren + 1 : close_paren],
+        fields[0],
+        int(fields[11]),
+        int(fields[12]),
+        int(fields[17]),
+        int(fields[19]),
+        int(fields[20]),
+        int(fields[21]),
+    )
+
+
+def parse_cpu_times(data: bytes) -> list[tuple[int, ...]]:
+    """Parse the cpu lines of /proc/stat.
+
+    Returns:
+        One tuple of jiffies per line (user, nice, system, idle, iowait, irq,
+        softirq, steal, guest, guest_nice), padded with zeros on older
+        kernels. Index 0 is the aggregate "cpu" line, followed by each core.
+    """
+    rows = []
+    for line in data.split(b"\n"):
+        if not line.startswith(b"cpu"):
+            break  # cpu lines always come first
+        fields = tuple(map(int, line.split()[1:11]))
+        rows.append(fields + (0,) * (10 - len(fields)))
+    return rows
+
+
+def parse_cpuinfo_mhz(data: bytes) -> list[float]:
+    """Parse the per-core "cpu MHz" lines of /proc/cpuinfo.
+
+    Returns:
+        Current frequency of each core in MHz, in core order; empty on
+        architectures that do not report it (e.g. most ARM kernels).
+    """
+    return [
+        float(line.partition(b":")[2])
+        for line in data.split(b"\n")
+        if line[:7].lower() == b"cpu mhz"
+    ]
+
+
+def parse_meminfo(data: bytes) -> dict[bytes, int]:
+    """Parse /proc/meminfo into a mapping of field name to bytes."""
+    values = {}
+    for line in data.split(b"\n"):
+        fields = line.split()
+        if len(fields) >= 2:
+            value = int(fields[1])
+            # Most fields are in kB; HugePages_* counts have no unit
+            values[fields[0].rstrip(b":")] = value * 1024 if len(fields) > 2 else value
+    return values
+
+
+def parse_vmstat(data: bytes) -> dict[bytes, int]:
+    """Parse /proc/vmstat into a mapping of counter name to value."""
+    values = {}
+    for line in data.split(b"\n"):
+        name, _, value = line.partition(b" ")
+        if value:
+            values[name] = int(value)
+    return values
+
+
+def parse_diskstats(data: bytes) -> dict[str, tuple[int, ...]]:
+    """Parse /proc/diskstats.
+
+    Returns:
+        Mapping of device name to (read_count, write_count, read_bytes,
+        write_bytes, read_time_ms, write_time_ms, busy_time_ms).
+    """
+    disks = {}
+    for line in data.split(b"\n"):
+        fields = line.split()
+        if len(fields) >= 14:
+            disks[fields[2].decode()] = (
+                int(fields[3]),
+                int(fields[7]),
+                int(fields[5]) * DISKSTATS_SECTOR_SIZE,
+                int(fields[9]) * DISKSTATS_SECTOR_SIZE,
+                int(fields[6]),
+                int(fields[10]),
+                int(fields[12]),
+            )
+        elif len(fields) == 7:
+            # Partition lines on old 2.6 kernels: reads, rsectors, writes, wsectors
+            disks[fields[2].decode()] = (
+                int(fields[3]),
+                int(fields[5]),
+                int(fields[4]) * DISKSTATS_SECTOR_SIZE,
+                int(fields[6]) * DISKSTATS_SECTOR_SIZE,
+                0,
+                0,
+                0,
+            )
+    return disks
+
+
+def parse_net_dev(data: bytes) -> dict[str, tuple[int, ...]]:
+    """Parse /proc/net/dev.
+
+    Returns:
+        Mapping of interface name to (bytes_recv, packets_recv, errin, dropin,
+        bytes_sent, packets_sent, errout, dropout).
+    """
+    interfaces = {}
+    for line in data.split(b"\n")[2:]:
+        name, sep, rest = line.rpartition(b":")
+        if not sep:
+            continue
+        fields = rest.split()
+        interfaces[name.strip().decode()] = (
+            int(fields[0]),
+            int(fields[1]),
+            int(fields[2]),
+            int(fields[3]),
+            int(fields[8]),
+            int(fields[9]),
+            int(fields[10]),
+            int(fields[11]),
+        )
+    return interfaces
+
+
+def count_socket_states(data: bytes) -> Counter[bytes]:
+    """Count sockets by state in /proc/net/tcp, tcp6, udp or udp6.
+
+    Returns:
+        Counter keyed by the two-digit hex state code (e.g. b"01" for
+        ESTABLISHED, b"0A" for LISTEN).
+    """
+    states = Counter()
+    for line in data.split(b"\n")[1:]:
+        fields = line.split(None, 4)
+        if len(fields) >= 4:
+            states[fields[3]] += 1
+    return states
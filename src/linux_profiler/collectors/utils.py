@@ -1,5 +1,17 @@
 """Utility functions for collectors."""
 
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional, installed with the "fast" extra
+    orjson = None
+
+
+# Unit suffixes for successive powers of 1024
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
 
 def bytes_to_human(bytes_value: int | float) -> str:
     """Convert bytes to human-readable format.
@@ -10,8 +22,28 @@ def bytes_to_human(bytes_value: int | float) -> str:
     Returns:
         Human-readable string representation (e.g., "1.5 GB")
     """
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.2f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.2f} PB"
+    # Every 10 bits is one power of 1024, so the bit length picks the unit directly
+    idx = min(max(0, (int(bytes_value).bit_length() - 1) // 10), len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (idx * 10)):.2f} {_BYTE_UNITS[idx]}"
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """Serialize collector output to UTF-8 JSON.
+
+    Uses orjson when it is installed and falls back to the standard library.
+    Values of other types (e.g. datetime, Path) are serialized with str().
+
+    Args:
+        data: JSON-serializable value
+        indent: Pretty-print with two-space indentation instead of compact output
+
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        # Non-string keys are stringified like the standard library does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=str, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode()
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode()
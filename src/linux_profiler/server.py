@@ -2,240 +2,490 @@
 
 import argparse
 import asyncio
-import json
+import base64
+import contextlib
+import functools
+import hashlib
+import inspect
+import logging
+import math
 import os
 import platform
+import time
 
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any
 
+try:
+    import fastjsonschema
+except ImportError:  # optional, installed with the "fast" extra
+    fastjsonschema = None
+try:
+    import msgpack
+except ImportError:  # optional, installed with the "fast" extra
+    msgpack = None
 from mcp.server import Server
+from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
 from mcp.server.sse import SseServerTransport
-from mcp.types import Tool, TextContent
+from mcp.types import BlobResourceContents, EmbeddedResource, Tool, TextContent
 from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.routing import Route
-from starlette.responses import JSONResponse
+from starlette.responses import Response
 
 from . import __version__
 from .collectors import (
+    CachedCollector,
     CPUCollector,
     MemoryCollector,
     DiskCollector,
     NetworkCollector,
     ProcessCollector,
     PerfCollector,
+    dumps_json,
 )
+from .collectors.base import BaseCollector
+
+logger = logging.getLogger(__name__)
 
 
 # Default configuration
 DEFAULT_PORT = 22222
 DEFAULT_HOST = "0.0.0.0"
+DEFAULT_TRANSPORT = "streamable"
+
+# Environment overrides, read once at import
+ENV_PORT = int(os.environ.get("PROFILER_PORT", DEFAULT_PORT))
+ENV_HOST = os.environ.get("PROFILER_HOST", DEFAULT_HOST)
+ENV_TRANSPORT = os.environ.get("PROFILER_TRANSPORT", DEFAULT_TRANSPORT)
+
+# Responses smaller than this (bytes) are not worth compressing
+GZIP_MINIMUM_SIZE = 1024
+
+# CORS policy for browser-based MCP clients: only the methods and headers the
+# transports use, with preflight results cached by the browser for a day
+CORS_ALLOW_METHODS = ("GET", "POST", "DELETE", "OPTIONS")
+CORS_ALLOW_HEADERS = (
+    "content-type",
+    "authorization",
+    "mcp-session-id",
+    "mcp-protocol-version",
+    "last-event-id",
+)
+CORS_EXPOSE_HEADERS = ("Mcp-Session-Id",)
+CORS_MAX_AGE = 86400
+
+# Performance summary thresholds, in percent: (critical, warning)
+CPU_PERCENT_THRESHOLDS = (90.0, 70.0)
+MEMORY_PERCENT_THRESHOLDS = (95.0, 80.0)
+DISK_PERCENT_THRESHOLDS = (95.0, 80.0)
+SWAP_PERCENT_THRESHOLDS = (math.inf, 50.0)  # swap only ever warns
+
+# Performance summary message templates: (critical, warning)
+_CPU_MESSAGES = ("Critical: CPU usage is very high (%s%%)", "Warning: CPU usage is elevated (%s%%)")
+_LOAD_MESSAGES = ("Critical: Load average (%s) is very high", "Warning: Load average (%s) exceeds core count")
+_MEMORY_MESSAGES = ("Critical: Memory usage is critical (%s%%)", "Warning: Memory usage is high (%s%%)")
+_SWAP_MESSAGES = ("", "Warning: Swap usage is high (%s%%)")
+_DISK_MESSAGES = ("Critical: Disk %s is almost full (%s%%)", "Warning: Disk %s usage is high (%s%%)")
+
+# Indent tool responses for human readers; compact JSON is smaller and faster to encode
+PRETTY_JSON = os.environ.get("PROFILER_PRETTY", "0") == "1"
+
+# Seconds between background refreshes of the system-wide collectors; 0 disables
+METRICS_REFRESH_INTERVAL = float(os.environ.get("PROFILER_REFRESH_SEC", "0"))
+
+# Seconds a system-wide collector result is reused across tool calls; 0 disables.
+# With background refresh, results stay valid until the next refresh lands.
+METRICS_CACHE_TTL = max(
+    float(os.environ.get("PROFILER_CACHE_TTL", "0.5")),
+    METRICS_REFRESH_INTERVAL * 1.5,
+)
 
 # Initialize collectors
-cpu_collector = CPUCollector()
-memory_collector = MemoryCollector()
-disk_collector = DiskCollector()
-network_collector = NetworkCollector()
+cpu_collector = CachedCollector(CPUCollector(), METRICS_CACHE_TTL)
+memory_collector = CachedCollector(MemoryCollector(), METRICS_CACHE_TTL)
+disk_collector = CachedCollector(DiskCollector(), METRICS_CACHE_TTL)
+network_collector = CachedCollector(NetworkCollector(), METRICS_CACHE_TTL)
 process_collector = ProcessCollector(top_n=10)
 perf_collector = PerfCollector()
 
 
-def create_mcp_server() -> Server:
-    """Create and configure MCP server instance."""
-    mcp_server = Server("linux-profiler")
+def _txt(text: str) -> list[TextContent]:
+    """Wrap text as a tool response."""
+    return [TextContent(type="text", text=text)]
 
-    def get_system_info() -> dict[str, Any]:
-        """Get basic system information."""
-        return {
-            "hostname": platform.node(),
-            "system": platform.system(),
-            "release": platform.release(),
-            "version": platform.version(),
-            "machine": platform.machine(),
-            "processor": platform.processor(),
-            "python_version": platform.python_version(),
-            "timestamp": datetime.now().isoformat(),
-        }
 
-    @mcp_server.list_tools()
-    async def list_tools() -> list[Tool]:
-        """List all available performance profiling tools."""
-        return [
-            Tool(
-                name="get_system_info",
-                description="Get basic system information including hostname, OS, kernel version, and architecture.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": [],
+def _msgpack_resource(data: Any, uri: str) -> list[EmbeddedResource]:
+    """Wrap data packed as MessagePack as a binary tool response."""
+    return [EmbeddedResource(
+        type="resource",
+        resource=BlobResourceContents(
+            uri=uri,
+            mimeType="application/msgpack",
+            blob=base64.b64encode(msgpack.packb(data, use_bin_type=True)).decode(),
+        ),
+    )]
+
+
+# Fixed argument errors, built once and returned as-is
+_PID_REQUIRED = _txt("Error: 'pid' parameter is required")
+_DURATION_OUT_OF_RANGE = _txt("Error: Duration must be between 1 and 300 seconds")
+_FREQUENCY_OUT_OF_RANGE = _txt("Error: Frequency must be between 1 and 10000 Hz")
+_MSGPACK_UNAVAILABLE = _txt("Error: msgpack encoding requires the msgpack package (pip install linux-profiler-mcp[fast])")
+
+
+@functools.cache
+def _static_system_info() -> dict[str, str]:
+    """Platform details, looked up once per server process."""
+    return {
+        "hostname": platform.node(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "version": platform.version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python_version": platform.python_version(),
+    }
+
+
+# (epoch second, ISO 8601 local time) of the last formatted timestamp
+_last_timestamp: tuple[int, str] = (-1, "")
+
+
+def _iso_now() -> str:
+    """Current local time in ISO 8601, formatted at most once per second."""
+    global _last_timestamp
+    now = int(time.time())
+    if now != _last_timestamp[0]:
+        _last_timestamp = (now, datetime.fromtimestamp(now).isoformat())
+    return _last_timestamp[1]
+
+
+def get_system_info() -> dict[str, Any]:
+    """Get basic system information."""
+    return {**_static_system_info(), "timestamp": _iso_now()}
+
+
+@asynccontextmanager
+async def background_refresh(interval: float):
+    """Refresh the cached system collectors every ``interval`` seconds while active.
+
+    Tool calls then read a recent snapshot instead of rescanning /proc.
+    Does nothing when ``interval`` is 0.
+    """
+    if interval <= 0:
+        yield
+        return
+
+    cached = (cpu_collector, memory_collector, disk_collector, network_collector)
+
+    async def refresh_loop():
+        while True:
+            # A failing collector is retried next round and must not stop the others
+            results = await asyncio.gather(
+                *(asyncio.to_thread(c.refresh) for c in cached), return_exceptions=True
+            )
+            for collector, result in zip(cached, results):
+                if isinstance(result, Exception):
+                    logger.warning(
+                        "Background refresh of %s failed",
+                        type(collector.collector).__name__,
+                        exc_info=result,
+                    )
+            await asyncio.sleep(interval)
+
+    task = asyncio.create_task(refresh_loop())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def collect_concurrently(collectors: dict[str, BaseCollector]) -> dict[str, dict[str, Any]]:
+    """Run collectors in worker threads without blocking the event loop.
+
+    Args:
+        collectors: Mapping of result key to collector
+
+    Returns:
+        Mapping of the same keys to each collector's collect() result
+    """
+    results = await asyncio.gather(
+        *(asyncio.to_thread(collector.collect) for collector in collectors.values())
+    )
+    return dict(zip(collectors, results))
+
+
+# Tool definitions as plain dicts, keyed the way the MCP SDK's Tool model
+# accepts them; argument handling below reads the schemas from here
+_TOOL_DEFINITIONS: tuple[dict[str, Any], ...] = (
+    dict(
+        name="get_system_info",
+        description="Get basic system information including hostname, OS, kernel version, and architecture.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    dict(
+        name="get_cpu_metrics",
+        description=cpu_collector.get_description(),
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    dict(
+        name="get_memory_metrics",
+        description=memory_collector.get_description(),
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    dict(
+        name="get_disk_metrics",
+        description=disk_collector.get_description(),
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    dict(
+        name="get_network_metrics",
+        description=network_collector.get_description(),
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    dict(
+        name="get_process_metrics",
+        description=process_collector.get_description(),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "top_n": {
+                    "type": "integer",
+                    "description": "Number of top processes to return (default: 10)",
+                    "default": 10,
                 },
-            ),
-            Tool(
-                name="get_cpu_metrics",
-                description=cpu_collector.get_description(),
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": [],
+            },
+            "required": [],
+        },
+    ),
+    dict(
+        name="get_all_metrics",
+        description="Get a comprehensive performance report including CPU, memory, disk, network, and process metrics.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "include_processes": {
+                    "type": "boolean",
+                    "description": "Whether to include process information (default: true)",
+                    "default": True,
                 },
-            ),
-            Tool(
-                name="get_memory_metrics",
-                description=memory_collector.get_description(),
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": [],
+                "encoding": {
+                    "type": "string",
+                    "description": "Response encoding: json text, or msgpack as a binary resource for programmatic clients (default: json)",
+                    "enum": ["json", "msgpack"],
+                    "default": "json",
                 },
-            ),
-            Tool(
-                name="get_disk_metrics",
-                description=disk_collector.get_description(),
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": [],
+            },
+            "required": [],
+        },
+    ),
+    dict(
+        name="get_performance_summary",
+        description="Get a brief performance summary with key metrics and potential issues.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    dict(
+        name="search_processes",
+        description="Search for processes by keyword (name or command line). Returns matching process IDs and details.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "keyword": {
+                    "type": "string",
+                    "description": "Keyword to search for in process names or command lines",
                 },
-            ),
-            Tool(
-                name="get_network_metrics",
-                description=network_collector.get_description(),
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": [],
+                "case_sensitive": {
+                    "type": "boolean",
+                    "description": "Whether to perform case-sensitive search (default: false)",
+                    "default": False,
                 },
-            ),
-            Tool(
-                name="get_process_metrics",
-                description=process_collector.get_description(),
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "top_n": {
-                            "type": "integer",
-                            "description": "Number of top processes to return (default: 10)",
-                            "default": 10,
-                        },
-                    },
-                    "required": [],
+            },
+            "required": ["keyword"],
+        },
+    ),
+    dict(
+        name="profile_process",
+        description="Profile a specific process using perf to collect performance data for flame graph generation. Requires perf tool to be installed on the system.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pid": {
+                    "type": "integer",
+                    "description": "Process ID to profile",
+                    "minimum": 1,
                 },
-            ),
-            Tool(
-                name="get_all_metrics",
-                description="Get a comprehensive performance report including CPU, memory, disk, network, and process metrics.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "include_processes": {
-                            "type": "boolean",
-                            "description": "Whether to include process information (default: true)",
-                            "default": True,
-                        },
-                    },
-                    "required": [],
+                "duration": {
+                    "type": "integer",
+                    "description": "Duration in seconds to collect data (default: 10)",
+                    "default": 10,
+                    "minimum": 1,
+                    "maximum": 300,
                 },
-            ),
-            Tool(
-                name="get_performance_summary",
-                description="Get a brief performance summary with key metrics and potential issues.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": [],
+                "frequency": {
+                    "type": "integer",
+                    "description": "Sampling frequency in Hz; overrides the mode preset",
+                    "minimum": 1,
+                    "maximum": 10000,
                 },
-            ),
-            Tool(
-                name="search_processes",
-                description="Search for processes by keyword (name or command line). Returns matching process IDs and details.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "keyword": {
-                            "type": "string",
-                            "description": "Keyword to search for in process names or command lines",
-                        },
-                        "case_sensitive": {
-                            "type": "boolean",
-                            "description": "Whether to perform case-sensitive search (default: false)",
-                            "default": False,
-                        },
-                    },
-                    "required": ["keyword"],
+                "mode": {
+                    "type": "string",
+                    "description": "Sampling preset: light (47 Hz), normal (97 Hz) or deep (997 Hz) (default: normal)",
+                    "enum": ["light", "normal", "deep"],
+                    "default": "normal",
                 },
-            ),
-            Tool(
-                name="profile_process",
-                description="Profile a specific process using perf to collect performance data for flame graph generation. Requires perf tool to be installed on the system.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "pid": {
-                            "type": "integer",
-                            "description": "Process ID to profile",
-                        },
-                        "duration": {
-                            "type": "integer",
-                            "description": "Duration in seconds to collect data (default: 10)",
-                            "default": 10,
-                            "minimum": 1,
-                            "maximum": 300,
-                        },
-                        "frequency": {
-                            "type": "integer",
-                            "description": "Sampling frequency in Hz (default: 99)",
-                            "default": 99,
-                            "minimum": 1,
-                            "maximum": 10000,
-                        },
-                        "event": {
-                            "type": "string",
-                            "description": "Perf event to record (default: cpu-clock). Other options: cycles, instructions, cache-misses",
-                            "default": "cpu-clock",
-                        },
-                    },
-                    "required": ["pid"],
+                "event": {
+                    "type": "string",
+                    "description": "Perf event to record (default: cpu-clock). Other options: cycles, instructions, cache-misses",
+                    "default": "cpu-clock",
                 },
-            ),
-        ]
+                "overwrite": {
+                    "type": "boolean",
+                    "description": "Record into a fixed-size ring buffer keeping only the newest samples (default: false)",
+                    "default": False,
+                },
+                "switch_output_event": {
+                    "type": "string",
+                    "description": "Perf event that dumps the ring buffer to a new snapshot each time it fires (optional)",
+                },
+                "low_overhead": {
+                    "type": "boolean",
+                    "description": "Use a larger ring buffer and skip build-id collection (default: true)",
+                    "default": True,
+                },
+            },
+            "required": ["pid"],
+        },
+    ),
+)
+
+# Tool definitions are static, so they are built once, as an immutable tuple,
+# and shared by every server
+_TOOLS: tuple[Tool, ...] = tuple(Tool(**definition) for definition in _TOOL_DEFINITIONS)
+
+# Content hash of the tool definitions. Exposed by the HTTP info endpoints so a
+# client can tell whether its cached tool list is current without re-listing.
+TOOLS_VERSION = hashlib.blake2b(
+    dumps_json([tool.model_dump(mode="json") for tool in _TOOLS]), digest_size=8
+).hexdigest()
+
+# Read-only tools whose concurrent identical calls are coalesced into one
+SINGLE_FLIGHT_TOOLS = frozenset({"get_all_metrics", "get_performance_summary"})
+
+# Argument names each tool's input schema declares; other arguments are ignored
+_TOOL_ARGUMENTS = {
+    definition["name"]: tuple(definition["inputSchema"]["properties"])
+    for definition in _TOOL_DEFINITIONS
+}
 
-    def generate_performance_summary() -> dict[str, Any]:
+# Input validators compiled once per tool schema. Without fastjsonschema the
+# MCP SDK validates (where it supports it) and profile_process checks bounds itself.
+_VALIDATORS: dict[str, Callable[[dict[str, Any]], Any]] = (
+    {
+        definition["name"]: fastjsonschema.compile(definition["inputSchema"])
+        for definition in _TOOL_DEFINITIONS
+    }
+    if fastjsonschema is not None else {}
+)
+
+# The compiled validators replace the SDK's per-call schema validation where it can be turned off
+_CALL_TOOL_OPTIONS = (
+    {"validate_input": False}
+    if _VALIDATORS and "validate_input" in inspect.signature(Server.call_tool).parameters
+    else {}
+)
+
+
+@functools.cache
+def create_mcp_server() -> Server:
+    """Create and configure the MCP server instance.
+
+    The server holds no per-connection state (each run() opens its own
+    session), so one instance is built per process and shared by every
+    transport.
+    """
+    mcp_server = Server("linux-profiler")
+
+    @mcp_server.list_tools()
+    async def list_tools() -> list[Tool]:
+        """List all available performance profiling tools."""
+        return list(_TOOLS)
+
+    async def generate_performance_summary() -> dict[str, Any]:
         """Generate a performance summary with potential issues."""
-        cpu = cpu_collector.collect()
-        memory = memory_collector.collect()
-        disk = disk_collector.collect()
+        metrics = await collect_concurrently({
+            "cpu": cpu_collector,
+            "memory": memory_collector,
+            "disk": disk_collector,
+        })
+        cpu = metrics["cpu"]
+        memory = metrics["memory"]
+        disk = metrics["disk"]
         
         issues = []
         warnings = []
         
-        # Check CPU
-        if cpu["overall_percent"] > 90:
-            issues.append(f"Critical: CPU usage is very high ({cpu['overall_percent']}%)")
-        elif cpu["overall_percent"] > 70:
-            warnings.append(f"Warning: CPU usage is elevated ({cpu['overall_percent']}%)")
+        cpu_percent = cpu["overall_percent"]
+        load_1min = cpu["load_average"]["1min"]
+        logical_cores = cpu["core_count_logical"]
+        memory_percent = memory["virtual"]["percent"]
+        swap_percent = memory["swap"]["percent"]
         
-        if cpu["load_average"]["1min"] > cpu["core_count_logical"] * 2:
-            issues.append(f"Critical: Load average ({cpu['load_average']['1min']}) is very high")
-        elif cpu["load_average"]["1min"] > cpu["core_count_logical"]:
-            warnings.append(f"Warning: Load average ({cpu['load_average']['1min']}) exceeds core count")
-        
-        # Check Memory
-        if memory["virtual"]["percent"] > 95:
-            issues.append(f"Critical: Memory usage is critical ({memory['virtual']['percent']}%)")
-        elif memory["virtual"]["percent"] > 80:
-            warnings.append(f"Warning: Memory usage is high ({memory['virtual']['percent']}%)")
-        
-        if memory["swap"]["percent"] > 50:
-            warnings.append(f"Warning: Swap usage is high ({memory['swap']['percent']}%)")
+        # (value, (critical, warning) thresholds, (critical, warning) messages), in report order
+        checks = (
+            (cpu_percent, CPU_PERCENT_THRESHOLDS, _CPU_MESSAGES),
+            (load_1min, (logical_cores * 2, logical_cores), _LOAD_MESSAGES),
+            (memory_percent, MEMORY_PERCENT_THRESHOLDS, _MEMORY_MESSAGES),
+            (swap_percent, SWAP_PERCENT_THRESHOLDS, _SWAP_MESSAGES),
+        )
+        for value, (critical, warning), (critical_msg, warning_msg) in checks:
+            if value > critical:
+                issues.append(critical_msg % value)
+            elif value > warning:
+                warnings.append(warning_msg % value)
         
-        # Check Disk
-        for partition in disk["partitions"]:
-            if partition["percent"] > 95:
-                issues.append(f"Critical: Disk {partition['mountpoint']} is almost full ({partition['percent']}%)")
-            elif partition["percent"] > 80:
-                warnings.append(f"Warning: Disk {partition['mountpoint']} usage is high ({partition['percent']}%)")
+        # Check Disk; messages are only formatted for partitions over a threshold
+        disk_critical, disk_warning = DISK_PERCENT_THRESHOLDS
+        full_partitions = [
+            (partition["mountpoint"], partition["percent"])
+            for partition in disk["partitions"]
+            if partition["percent"] > disk_warning
+        ]
+        for mountpoint, percent in full_partitions:
+            if percent > disk_critical:
+                issues.append(_DISK_MESSAGES[0] % (mountpoint, percent))
+            else:
+                warnings.append(_DISK_MESSAGES[1] % (mountpoint, percent))
         
         # Determine overall status
         if issues:
@@ -247,108 +497,182 @@ def create_mcp_server() -> Server:
         
         return {
             "status": status,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_now(),
             "summary": {
-                "cpu_percent": cpu["overall_percent"],
-                "load_average_1min": cpu["load_average"]["1min"],
-                "memory_percent": memory["virtual"]["percent"],
-                "swap_percent": memory["swap"]["percent"],
+                "cpu_percent": cpu_percent,
+                "load_average_1min": load_1min,
+                "memory_percent": memory_percent,
+                "swap_percent": swap_percent,
             },
             "issues": issues,
             "warnings": warnings,
         }
 
-    @mcp_server.call_tool()
-    async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-        """Handle tool calls for performance profiling."""
-        try:
-            if name == "get_system_info":
-                result = get_system_info()
-            
-            elif name == "get_cpu_metrics":
-                result = cpu_collector.collect()
-            
-            elif name == "get_memory_metrics":
-                result = memory_collector.collect()
-            
-            elif name == "get_disk_metrics":
-                result = disk_collector.collect()
-            
-            elif name == "get_network_metrics":
-                result = network_collector.collect()
-            
-            elif name == "get_process_metrics":
-                top_n = arguments.get("top_n", 10)
-                collector = ProcessCollector(top_n=top_n)
-                result = collector.collect()
-            
-            elif name == "get_all_metrics":
-                include_processes = arguments.get("include_processes", True)
-                result = {
-                    "system": get_system_info(),
-                    "cpu": cpu_collector.collect(),
-                    "memory": memory_collector.collect(),
-                    "disk": disk_collector.collect(),
-                    "network": network_collector.collect(),
-                }
-                if include_processes:
-                    result["processes"] = process_collector.collect()
-            
-            elif name == "get_performance_summary":
-                result = generate_performance_summary()
-            
-            elif name == "search_processes":
-                keyword = arguments.get("keyword", "")
-                case_sensitive = arguments.get("case_sensitive", False)
-                result = process_collector.search_processes(keyword, case_sensitive)
+    async def system_info(_arguments: dict[str, Any]) -> dict[str, Any]:
+        return get_system_info()
+
+    async def get_process_metrics(arguments: dict[str, Any]) -> dict[str, Any]:
+        top_n = arguments.get("top_n", 10)
+        # Reuse the shared collector so CPU percent has a baseline from earlier calls
+        return await asyncio.to_thread(process_collector.collect, top_n=top_n)
+
+    async def get_all_metrics(
+        arguments: dict[str, Any]
+    ) -> dict[str, Any] | list[EmbeddedResource | TextContent]:
+        include_processes = arguments.get("include_processes", True)
+        use_msgpack = arguments.get("encoding", "json") == "msgpack"
+        if use_msgpack and msgpack is None:
+            return _MSGPACK_UNAVAILABLE
+        collectors = {
+            "cpu": cpu_collector,
+            "memory": memory_collector,
+            "disk": disk_collector,
+            "network": network_collector,
+        }
+        if include_processes:
+            collectors["processes"] = process_collector
+        result = {"system": get_system_info(), **await collect_concurrently(collectors)}
+        if use_msgpack:
+            return _msgpack_resource(result, "linux-profiler://metrics/all")
+        return result
+
+    async def search_processes(arguments: dict[str, Any]) -> dict[str, Any]:
+        keyword = arguments.get("keyword", "")
+        case_sensitive = arguments.get("case_sensitive", False)
+        return await asyncio.to_thread(
+            process_collector.search_processes, keyword, case_sensitive
+        )
+
+    async def profile_process(arguments: dict[str, Any]) -> dict[str, Any] | list[TextContent]:
+        pid = arguments.get("pid")
+        if pid is None:
+            return _PID_REQUIRED
+
+        duration = arguments.get("duration", 10)
+        frequency = arguments.get("frequency")
+        event = arguments.get("event", "cpu-clock")
+        mode = arguments.get("mode", "normal")
+        overwrite = arguments.get("overwrite", False)
+        switch_output_event = arguments.get("switch_output_event")
+        low_overhead = arguments.get("low_overhead", True)
+
+        # Validate parameters unless the compiled schema validator already did
+        if "profile_process" not in _VALIDATORS:
+            if not isinstance(pid, int) or pid <= 0:
+                return _txt(f"Error: Invalid PID: {pid}")
             
-            elif name == "profile_process":
-                pid = arguments.get("pid")
-                if pid is None:
-                    return [TextContent(type="text", text="Error: 'pid' parameter is required")]
-                
-                duration = arguments.get("duration", 10)
-                frequency = arguments.get("frequency", 99)
-                event = arguments.get("event", "cpu-clock")
-                
-                # Validate parameters
-                if not isinstance(pid, int) or pid <= 0:
-                    return [TextContent(type="text", text=f"Error: Invalid PID: {pid}")]
-                
-                if not (1 <= duration <= 300):
-                    return [TextContent(type="text", text=f"Error: Duration must be between 1 and 300 seconds")]
-                
-                if not (1 <= frequency <= 10000):
-                    return [TextContent(type="text", text=f"Error: Frequency must be between 1 and 10000 Hz")]
-                
-                result = perf_collector.collect_process_profile(
-                    pid=pid,
-                    duration=duration,
-                    frequency=frequency,
-                    event=event
-                )
+            if not (1 <= duration <= 300):
+                return _DURATION_OUT_OF_RANGE
             
-            else:
-                return [TextContent(type="text", text=f"Unknown tool: {name}")]
+            if frequency is not None and not (1 <= frequency <= 10000):
+                return _FREQUENCY_OUT_OF_RANGE
+
+        # perf record is awaited as a subprocess; parsing runs in worker threads
+        return await perf_collector.collect_process_profile_async(
+            pid=pid,
+            duration=duration,
+            frequency=frequency,
+            event=event,
+            mode=mode,
+            overwrite=overwrite,
+            switch_output_event=switch_output_event,
+            low_overhead=low_overhead
+        )
+
+    # Tool name -> handler; a handler returns the result to serialize or a ready response
+    handlers: dict[str, Callable[[dict[str, Any]], Awaitable[dict[str, Any] | list[Any]]]] = {
+        "get_system_info": system_info,
+        "get_cpu_metrics": lambda _arguments: asyncio.to_thread(cpu_collector.collect),
+        "get_memory_metrics": lambda _arguments: asyncio.to_thread(memory_collector.collect),
+        "get_disk_metrics": lambda _arguments: asyncio.to_thread(disk_collector.collect),
+        "get_network_metrics": lambda _arguments: asyncio.to_thread(network_collector.collect),
+        "get_process_metrics": get_process_metrics,
+        "get_all_metrics": get_all_metrics,
+        "get_performance_summary": lambda _arguments: generate_performance_summary(),
+        "search_processes": search_processes,
+        "profile_process": profile_process,
+    }
+
+    async def respond(
+        name: str,
+        handler: Callable[[dict[str, Any]], Awaitable[dict[str, Any] | list[Any]]],
+        arguments: dict[str, Any]
+    ) -> list[TextContent | EmbeddedResource]:
+        """Run a tool handler and render its result as a tool response."""
+        try:
+            result = await handler(arguments)
+            if isinstance(result, list):
+                return result
 
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+            return _txt(dumps_json(result, indent=PRETTY_JSON).decode())
         
         except Exception as e:
-            return [TextContent(type="text", text=f"Error executing {name}: {str(e)}")]
+            # The class name keeps errors like KeyError('x') or a bare OSError() readable
+            return _txt(f"Error executing {name} ({type(e).__name__}): {e}")
+
+    # In-flight responses of SINGLE_FLIGHT_TOOLS, keyed by tool name and arguments
+    inflight: dict[tuple[str, tuple[tuple[str, Any], ...]], asyncio.Future] = {}
+
+    @mcp_server.call_tool(**_CALL_TOOL_OPTIONS)
+    async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent | EmbeddedResource]:
+        """Handle tool calls for performance profiling."""
+        handler = handlers.get(name)
+        if handler is None:
+            return _txt(f"Unknown tool: {name}")
+
+        validator = _VALIDATORS.get(name)
+        if validator is not None:
+            try:
+                validator(arguments)
+            except fastjsonschema.JsonSchemaException as e:
+                # Raised so that the SDK reports it as an error result, as its own validation does
+                raise ValueError(f"Input validation error: {e.message}") from e
+
+        if name not in SINGLE_FLIGHT_TOOLS:
+            return await respond(name, handler, arguments)
+
+        # Concurrent identical calls share one collection and one serialized response;
+        # undeclared arguments do not change the response, so they are left out of the key
+        key = (name, tuple(
+            (argument, arguments[argument])
+            for argument in _TOOL_ARGUMENTS[name]
+            if argument in arguments
+        ))
+        try:
+            future = inflight.get(key)
+        except TypeError:
+            # Unhashable value for a declared argument, only possible without
+            # fastjsonschema validation: run the call on its own
+            return await respond(name, handler, arguments)
+        if future is None:
+            future = asyncio.ensure_future(respond(name, handler, arguments))
+            inflight[key] = future
+            future.add_done_callback(lambda _f: inflight.pop(key, None))
+        # Shielded so that one caller going away does not cancel the others' result
+        return await asyncio.shield(future)
 
     return mcp_server
 
 
+@functools.cache
+def initialization_options() -> InitializationOptions:
+    """Initialization options of the shared server; invariant once tools are registered."""
+    return create_mcp_server().create_initialization_options()
+
+
 # ============ STDIO Mode ============
 
 async def run_stdio_server():
     """Run the MCP server in STDIO mode."""
     server = create_mcp_server()
-    async with stdio_server() as (read_stream, write_stream):
+    async with (
+        background_refresh(METRICS_REFRESH_INTERVAL),
+        stdio_server() as (read_stream, write_stream),
+    ):
         await server.run(
             read_stream,
             write_stream,
-            server.create_initialization_options(),
+            initialization_options(),
         )
 
 
@@ -364,11 +688,7 @@ def create_sse_app() -> Starlette:
         async with sse_transport.connect_sse(
             request.scope, request.receive, request._send
         ) as streams:
-            await server.run(
-                streams[0],
-                streams[1],
-                server.create_initialization_options(),
-            )
+            await server.run(streams[0], streams[1], initialization_options())
 
     async def handle_messages(request):
         """Handle POST messages for MCP."""
@@ -376,27 +696,32 @@ def create_sse_app() -> Starlette:
             request.scope, request.receive, request._send
         )
 
+    health_body = dumps_json({
+        "status": "ok",
+        "service": "linux-profiler",
+        "version": __version__,
+        "transport": "sse",
+    })
+
     async def health_check(_request):
         """Health check endpoint."""
-        return JSONResponse({
-            "status": "ok",
-            "service": "linux-profiler",
-            "version": __version__,
-            "transport": "sse",
-        })
+        return Response(health_body, media_type="application/json")
+
+    info_body = dumps_json({
+        "name": "linux-profiler",
+        "version": __version__,
+        "tools_version": TOOLS_VERSION,
+        "transport": "sse",
+        "endpoints": {
+            "sse": "/sse",
+            "messages": "/messages/",
+            "health": "/health",
+        },
+    })
 
     async def server_info(_request):
         """Server info endpoint."""
-        return JSONResponse({
-            "name": "linux-profiler",
-            "version": __version__,
-            "transport": "sse",
-            "endpoints": {
-                "sse": "/sse",
-                "messages": "/messages/",
-                "health": "/health",
-            },
-        })
+        return Response(info_body, media_type="application/json")
 
     app = Starlette(
         debug=False,
@@ -439,32 +764,37 @@ def create_streamable_http_app(stateless: bool = False) -> Starlette:
         async with session_manager.run():
             yield
 
+    health_body = dumps_json({
+        "status": "ok",
+        "service": "linux-profiler",
+        "version": __version__,
+        "transport": "streamable-http",
+        "stateless": stateless,
+    })
+
     async def health_check(_request):
         """Health check endpoint."""
-        return JSONResponse({
-            "status": "ok",
-            "service": "linux-profiler",
-            "version": __version__,
-            "transport": "streamable-http",
-            "stateless": stateless,
-        })
+        return Response(health_body, media_type="application/json")
+
+    info_body = dumps_json({
+        "name": "linux-profiler",
+        "version": __version__,
+        "tools_version": TOOLS_VERSION,
+        "transport": "streamable-http",
+        "stateless": stateless,
+        "endpoints": {
+            "mcp": "/mcp",
+            "health": "/health",
+        },
+        "capabilities": {
+            "streaming": True,
+            "json_response": True,
+        },
+    })
 
     async def server_info(_request):
         """Server info endpoint."""
-        return JSONResponse({
-            "name": "linux-profiler",
-            "version": __version__,
-            "transport": "streamable-http",
-            "stateless": stateless,
-            "endpoints": {
-                "mcp": "/mcp",
-                "health": "/health",
-            },
-            "capabilities": {
-                "streaming": True,
-                "json_response": True,
-            },
-        })
+        return Response(info_body, media_type="application/json")
     
     app = Starlette(
         debug=False,
@@ -476,14 +806,18 @@ def create_streamable_http_app(stateless: bool = False) -> Starlette:
         ],
     )
     
+    # Compress JSON responses; SSE streams (text/event-stream) are left uncompressed
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
-        allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
-        allow_headers=["*"],
-        expose_headers=["Mcp-Session-Id"],
+        allow_methods=CORS_ALLOW_METHODS,
+        allow_headers=CORS_ALLOW_HEADERS,
+        expose_headers=CORS_EXPOSE_HEADERS,
+        max_age=CORS_MAX_AGE,
     )
     
     return app
@@ -499,7 +833,7 @@ def create_combined_http_app(stateless: bool = False) -> Starlette:
     
     sse_transport = SseServerTransport("/sse/messages/")
     
-    # Create MCP server for Streamable HTTP
+    # One MCP server serves both transports; each connection gets its own session
     mcp_server = create_mcp_server()
     
     # Create session manager for Streamable HTTP
@@ -518,15 +852,10 @@ def create_combined_http_app(stateless: bool = False) -> Starlette:
     # SSE handlers
     async def handle_sse(request):
         """Handle SSE connection for MCP."""
-        server = create_mcp_server()
         async with sse_transport.connect_sse(
             request.scope, request.receive, request._send
         ) as streams:
-            await server.run(
-                streams[0],
-                streams[1],
-                server.create_initialization_options(),
-            )
+            await mcp_server.run(streams[0], streams[1], initialization_options())
 
     async def handle_sse_messages(request):
         """Handle POST messages for SSE transport."""
@@ -534,32 +863,37 @@ def create_combined_http_app(stateless: bool = False) -> Starlette:
             request.scope, request.receive, request._send
         )
 
+    health_body = dumps_json({
+        "status": "ok",
+        "service": "linux-profiler",
+        "version": __version__,
+        "transports": ["sse", "streamable-http"],
+    })
+
     async def health_check(_request):
         """Health check endpoint."""
-        return JSONResponse({
-            "status": "ok",
-            "service": "linux-profiler",
-            "version": __version__,
-            "transports": ["sse", "streamable-http"],
-        })
+        return Response(health_body, media_type="application/json")
+
+    info_body = dumps_json({
+        "name": "linux-profiler",
+        "version": __version__,
+        "tools_version": TOOLS_VERSION,
+        "transports": {
+            "sse": {
+                "endpoint": "/sse",
+                "messages": "/sse/messages/",
+            },
+            "streamable-http": {
+                "endpoint": "/mcp",
+                "stateless": stateless,
+            },
+        },
+        "health": "/health",
+    })
 
     async def server_info(_request):
         """Server info endpoint."""
-        return JSONResponse({
-            "name": "linux-profiler",
-            "version": __version__,
-            "transports": {
-                "sse": {
-                    "endpoint": "/sse",
-                    "messages": "/sse/messages/",
-                },
-                "streamable-http": {
-                    "endpoint": "/mcp",
-                    "stateless": stateless,
-                },
-            },
-            "health": "/health",
-        })
+        return Response(info_body, media_type="application/json")
     
     app = Starlette(
         debug=False,
@@ -576,14 +910,18 @@ def create_combined_http_app(stateless: bool = False) -> Starlette:
         ],
     )
     
+    # Compress JSON responses; SSE streams (text/event-stream) are left uncompressed
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
-        allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
-        allow_headers=["*"],
-        expose_headers=["Mcp-Session-Id"],
+        allow_methods=CORS_ALLOW_METHODS,
+        allow_headers=CORS_ALLOW_HEADERS,
+        expose_headers=CORS_EXPOSE_HEADERS,
+        max_age=CORS_MAX_AGE,
     )
     
     return app
@@ -600,6 +938,13 @@ async def run_http_server(host: str, port: int, transport: str = "streamable", s
     """
     import uvicorn
     
+    # httptools is a dependency, but keep serving with the pure-Python h11 parser without it
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+
     if transport == "sse":
         app = create_sse_app()
         transport_name = "SSE"
@@ -615,6 +960,9 @@ async def run_http_server(host: str, port: int, transport: str = "streamable", s
         host=host,
         port=port,
         log_level="info",
+        http=http,
+        # Per-request access log lines are formatting overhead on every SSE/JSON frame
+        access_log=False,
     )
     http_server = uvicorn.Server(config)
     
@@ -632,17 +980,14 @@ async def run_http_server(host: str, port: int, transport: str = "streamable", s
         print(f"Streamable HTTP endpoint: http://{host}:{port}/mcp")
         print(f"Streamable mode: {'stateless' if stateless else 'stateful'}")
     
-    await http_server.serve()
+    async with background_refresh(METRICS_REFRESH_INTERVAL):
+        await http_server.serve()
 
 
 # ============ Main Entry ============
 
-def parse_args():
-    """Parse command line arguments."""
-    parser = argparse.ArgumentParser(
-        description="Linux Performance Profiler MCP Server",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+# Help epilog, shown by --help
+_EPILOG = """
 Examples:
   # Run in STDIO mode (default)
   linux-profiler
@@ -666,7 +1011,18 @@ Environment variables:
   PROFILER_PORT       Default HTTP port (default: 22222)
   PROFILER_HOST       Default HTTP host (default: 0.0.0.0)
   PROFILER_TRANSPORT  Default transport type (default: streamable)
-        """
+  PROFILER_CACHE_TTL  Seconds to reuse system metrics between calls (default: 0.5, 0 disables)
+  PROFILER_REFRESH_SEC  Refresh system metrics in the background every N seconds (default: 0, off)
+  PROFILER_PRETTY     Set to 1 to indent JSON tool responses (default: compact)
+"""
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Linux Performance Profiler MCP Server",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
     )
     
     parser.add_argument(
@@ -677,20 +1033,20 @@ Environment variables:
     parser.add_argument(
         "--port", "-p",
         type=int,
-        default=int(os.environ.get("PROFILER_PORT", DEFAULT_PORT)),
+        default=ENV_PORT,
         help=f"HTTP server port (default: {DEFAULT_PORT})",
     )
     parser.add_argument(
         "--host", "-H",
         type=str,
-        default=os.environ.get("PROFILER_HOST", DEFAULT_HOST),
+        default=ENV_HOST,
         help=f"HTTP server host (default: {DEFAULT_HOST})",
     )
     parser.add_argument(
         "--transport", "-t",
         type=str,
         choices=["sse", "streamable", "both"],
-        default=os.environ.get("PROFILER_TRANSPORT", "streamable"),
+        default=ENV_TRANSPORT,
         help="HTTP transport type: sse (legacy), streamable (new), or both (default: streamable)",
     )
     parser.add_argument(
@@ -706,15 +1062,21 @@ def main():
     """Main entry point."""
     args = parse_args()
     
+    # uvloop is installed everywhere but Windows; both transports run on whichever loop runs them
+    try:
+        from uvloop import run as run_event_loop
+    except ImportError:
+        run_event_loop = asyncio.run
+
     if args.http:
-        asyncio.run(run_http_server(
+        run_event_loop(run_http_server(
             args.host,
             args.port,
             transport=args.transport,
             stateless=args.stateless,
         ))
     else:
-        asyncio.run(run_stdio_server())
+        run_event_loop(run_stdio_server())
 
 
 if __name__ == "__main__":
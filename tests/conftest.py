@@ -0,0 +1,44 @@
+"""Shared test fixtures."""
+
+import pytest
+
+
+class FakeProcFile:
+    """Stand-in for procfs.ProcFile that serves fixed content.
+
+    Each read returns the next of the given contents; the last one is
+    repeated once they are used up, like a /proc file that stopped changing.
+    """
+
+    def __init__(self, *contents: bytes):
+        self._contents = list(contents)
+
+    def read(self) -> bytes:
+        if len(self._contents) > 1:
+            return self._contents.pop(0)
+        return self._contents[0]
+
+    def read_small(self, size: int = 4096) -> bytes:
+        return self.read()[:size]
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_proc(monkeypatch):
+    """Serve fixed /proc content to the collectors in a module.
+
+    Returns a function taking the collector module and a mapping of /proc
+    path to the content of successive reads (a single bytes value, or a
+    list of them); paths not in the mapping are reported missing.
+    """
+
+    def install(module, files: dict[str, bytes | list[bytes]]) -> None:
+        proc_files = {
+            path: FakeProcFile(*(content if isinstance(content, list) else [content]))
+            for path, content in files.items()
+        }
+        monkeypatch.setattr(module, "open_proc_file", proc_files.get)
+
+    return install
@@ -0,0 +1,100 @@
+"""Tests for the TTL cache around collectors."""
+
+import threading
+from typing import Any
+
+import pytest
+
+from linux_profiler.collectors import cached
+from linux_profiler.collectors.base import BaseCollector
+from linux_profiler.collectors.cached import CachedCollector
+
+
+class CountingCollector(BaseCollector):
+    """Returns a new result, numbered from 1, on each collect."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def collect(self) -> dict[str, Any]:
+        self.calls += 1
+        return {"call": self.calls}
+
+    def get_description(self) -> str:
+        return "Counts collects."
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the cache, in seconds."""
+    now = [1000.0]
+    monkeypatch.setattr(cached.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_results_are_reused_within_the_ttl(clock):
+    collector = CountingCollector()
+    cache = CachedCollector(collector, ttl=0.5)
+
+    first = cache.collect()
+    clock[0] += 0.4
+    second = cache.collect()
+
+    assert first == {"call": 1}
+    assert second is first
+    assert collector.calls == 1
+
+
+def test_results_expire_after_the_ttl(clock):
+    collector = CountingCollector()
+    cache = CachedCollector(collector, ttl=0.5)
+
+    cache.collect()
+    clock[0] += 0.5
+
+    assert cache.collect() == {"call": 2}
+    clock[0] += 0.1
+    assert cache.collect() == {"call": 2}
+
+
+def test_refresh_collects_regardless_of_age(clock):
+    collector = CountingCollector()
+    cache = CachedCollector(collector, ttl=10)
+
+    cache.collect()
+
+    assert cache.refresh() == {"call": 2}
+    # The refreshed result is what later calls get
+    assert cache.collect() == {"call": 2}
+
+
+def test_zero_ttl_disables_caching(clock):
+    cache = CachedCollector(CountingCollector(), ttl=0)
+
+    assert [cache.collect()["call"] for _ in range(3)] == [1, 2, 3]
+
+
+def test_description_is_the_wrapped_collector_s():
+    assert CachedCollector(CountingCollector()).get_description() == "Counts collects."
+
+
+def test_concurrent_misses_share_one_collect():
+    release = threading.Event()
+
+    class SlowCollector(CountingCollector):
+        def collect(self) -> dict[str, Any]:
+            release.wait(5)
+            return super().collect()
+
+    collector = SlowCollector()
+    cache = CachedCollector(collector, ttl=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.collect())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert collector.calls == 1
+    assert results == [{"call": 1}] * 4
@@ -0,0 +1,101 @@
+"""Tests for the CPU collector's /proc/stat sampling."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from linux_profiler.collectors import cpu
+from linux_profiler.collectors.cpu import CPUCollector
+
+STAT_BEFORE = b"""\
+cpu  100 0 50 800 50 0 0 0 0 0
+cpu0 50 0 25 400 25 0 0 0 0 0
+cpu1 50 0 25 400 25 0 0 0 0 0
+intr 0
+"""
+
+# cpu0: +30 user, +10 system, +50 idle, +10 iowait (40% busy)
+# cpu1: +10 user, +90 idle (10% busy)
+STAT_AFTER = b"""\
+cpu  140 0 60 940 60 0 0 0 0 0
+cpu0 80 0 35 450 35 0 0 0 0 0
+cpu1 60 0 25 490 25 0 0 0 0 0
+intr 0
+"""
+
+CPUINFO = b"processor\t: 0\ncpu MHz\t\t: 2100.000\n\nprocessor\t: 1\ncpu MHz\t\t: 1799.512\n\n"
+
+
+@pytest.fixture
+def two_cores(monkeypatch):
+    """Report two cores with fixed frequency limits."""
+    monkeypatch.setattr(cpu.psutil, "cpu_count", lambda logical=True: 2)
+    monkeypatch.setattr(
+        cpu.psutil,
+        "cpu_freq",
+        lambda percpu=False: [SimpleNamespace(current=1000.0, min=800.0, max=3500.0)] * 2,
+    )
+
+
+def test_first_collect_with_no_time_elapsed(fake_proc, two_cores):
+    fake_proc(cpu, {"/proc/stat": STAT_BEFORE})
+
+    metrics = CPUCollector().collect()
+
+    assert metrics["overall_percent"] == 0.0
+    assert metrics["per_core_percent"] == [0.0, 0.0]
+    assert metrics["times"] == {
+        "user": 0.0,
+        "system": 0.0,
+        "idle": 0.0,
+        "iowait": 0.0,
+        "irq": 0.0,
+        "softirq": 0.0,
+    }
+
+
+def test_usage_is_the_delta_since_the_previous_sample(fake_proc, two_cores):
+    fake_proc(cpu, {"/proc/stat": [STAT_BEFORE, STAT_AFTER]})
+
+    metrics = CPUCollector().collect()
+
+    assert metrics["per_core_percent"] == [40.0, 10.0]
+    assert metrics["overall_percent"] == 25.0
+    assert metrics["times"] == {
+        "user": 20.0,
+        "system": 5.0,
+        "idle": 70.0,
+        "iowait": 5.0,
+        "irq": 0.0,
+        "softirq": 0.0,
+    }
+
+
+def test_counters_going_backwards_count_as_idle(fake_proc, two_cores):
+    # e.g. a CPU that went offline and came back
+    fake_proc(cpu, {"/proc/stat": [STAT_AFTER, STAT_BEFORE]})
+
+    metrics = CPUCollector().collect()
+
+    assert metrics["per_core_percent"] == [0.0, 0.0]
+
+
+def test_frequencies_come_from_cpuinfo(fake_proc, two_cores):
+    fake_proc(cpu, {"/proc/stat": STAT_BEFORE, "/proc/cpuinfo": CPUINFO})
+
+    frequency = CPUCollector().collect()["frequency"]
+
+    assert frequency == [
+        {"core": 0, "current_mhz": 2100.0, "min_mhz": 800.0, "max_mhz": 3500.0},
+        {"core": 1, "current_mhz": 1799.51, "min_mhz": 800.0, "max_mhz": 3500.0},
+    ]
+
+
+def test_frequencies_fall_back_to_psutil(fake_proc, two_cores):
+    # One "cpu MHz" line for two cores: psutil decides
+    cpuinfo = b"processor\t: 0\ncpu MHz\t\t: 2100.000\n\n"
+    fake_proc(cpu, {"/proc/stat": STAT_BEFORE, "/proc/cpuinfo": cpuinfo})
+
+    frequency = CPUCollector().collect()["frequency"]
+
+    assert [core["current_mhz"] for core in frequency] == [1000.0, 1000.0]
@@ -0,0 +1,81 @@
+"""Tests for the memory collector's /proc/meminfo reader."""
+
+import os
+
+from linux_profiler.collectors import memory
+from linux_profiler.collectors.memory import MemoryCollector
+
+MEMINFO = b"""\
+MemTotal:        8000000 kB
+MemFree:         1000000 kB
+MemAvailable:    6000000 kB
+Buffers:          200000 kB
+Cached:          2000000 kB
+SwapCached:            0 kB
+Shmem:             50000 kB
+SReclaimable:     100000 kB
+SwapTotal:       2000000 kB
+SwapFree:        1500000 kB
+HugePages_Total:       0
+"""
+
+VMSTAT = b"nr_free_pages 250000\npswpin 10\npswpout 20\n"
+
+
+def test_collect_from_meminfo(fake_proc):
+    fake_proc(memory, {"/proc/meminfo": MEMINFO, "/proc/vmstat": VMSTAT})
+    page_size = os.sysconf("SC_PAGE_SIZE")
+
+    metrics = MemoryCollector().collect()
+
+    virtual = metrics["virtual"]
+    assert virtual["total_bytes"] == 8000000 * 1024
+    assert virtual["available_bytes"] == 6000000 * 1024
+    assert virtual["used_bytes"] == 2000000 * 1024
+    assert virtual["free_bytes"] == 1000000 * 1024
+    assert virtual["percent"] == 25.0
+    assert virtual["buffers_bytes"] == 200000 * 1024
+    # Reclaimable slab counts as cache
+    assert virtual["cached_bytes"] == 2100000 * 1024
+    assert virtual["shared_bytes"] == 50000 * 1024
+
+    swap = metrics["swap"]
+    assert swap["total_bytes"] == 2000000 * 1024
+    assert swap["used_bytes"] == 500000 * 1024
+    assert swap["free_bytes"] == 1500000 * 1024
+    assert swap["percent"] == 25.0
+    assert swap["sin_bytes"] == 10 * page_size
+    assert swap["sout_bytes"] == 20 * page_size
+
+
+def test_available_estimated_without_memavailable(fake_proc):
+    # Kernels before 3.14 have no MemAvailable
+    meminfo = b"".join(line + b"\n" for line in MEMINFO.splitlines() if b"MemAvailable" not in line)
+    fake_proc(memory, {"/proc/meminfo": meminfo})
+
+    metrics = MemoryCollector().collect()
+
+    # free + buffers + cached + reclaimable slab
+    assert metrics["virtual"]["available_bytes"] == 3300000 * 1024
+    assert metrics["swap"]["sin_bytes"] == 0
+
+
+def test_available_above_total_falls_back_to_free(fake_proc):
+    # Seen inside some containers
+    meminfo = MEMINFO.replace(b"MemAvailable:    6000000", b"MemAvailable:    9000000")
+    fake_proc(memory, {"/proc/meminfo": meminfo, "/proc/vmstat": VMSTAT})
+
+    virtual = MemoryCollector().collect()["virtual"]
+
+    assert virtual["available_bytes"] == 1000000 * 1024
+    assert virtual["percent"] == 87.5
+
+
+def test_no_swap(fake_proc):
+    meminfo = MEMINFO.replace(b"2000000 kB\nSwapFree:        1500000", b"0 kB\nSwapFree:        0")
+    fake_proc(memory, {"/proc/meminfo": meminfo, "/proc/vmstat": VMSTAT})
+
+    swap = MemoryCollector().collect()["swap"]
+
+    assert swap["total_bytes"] == 0
+    assert swap["percent"] == 0.0
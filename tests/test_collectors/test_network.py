@@ -0,0 +1,88 @@
+"""Tests for the network collector's /proc/net readers."""
+
+from linux_profiler.collectors import network
+from linux_profiler.collectors.network import NetworkCollector
+
+NET_DEV = b"""\
+Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:    1000      10    0    0    0     0          0         0     1000      10    0    0    0     0       0          0
+  eth0:12345678   5000    1    2    0     0          0         0  7654321    4000    3    4    0     0       0          0
+"""
+
+SOCKET_HEADER = (
+    b"  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt"
+    b"   uid  timeout inode\n"
+)
+
+TCP_ROWS = b"""\
+   0: 00000000:0016 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1001 1 0 100 0 0 10 0
+   1: 0100007F:1F90 0100007F:C350 01 00000000:00000000 00:00000000 00000000  1000        0 1002 1 0 20 4 30 10 -1
+   2: 0100007F:C350 0100007F:1F90 08 00000000:00000000 00:00000000 00000000  1000        0 1003 1 0 20 4 30 10 -1
+   3: 0100007F:1F90 0100007F:C352 06 00000000:00000000 03:00000F9B 00000000     0        0 0 3 0
+"""
+
+TCP = SOCKET_HEADER + TCP_ROWS
+
+TCP6 = SOCKET_HEADER + (
+    b"   0: 00000000000000000000000000000000:0016 00000000000000000000000000000000:0000 0A"
+    b" 00000000:00000000 00:00000000 00000000     0        0 2001 1 0 100 0 0 10 0\n"
+)
+
+# UDP sockets report 07 (TCP_CLOSE) and must not be counted as a TCP state
+UDP = SOCKET_HEADER + (
+    b"  100: 00000000:0044 00000000:0000 07 00000000:00000000 00:00000000 00000000"
+    b"     0        0 3001 2 0 0\n"
+)
+
+
+def test_interfaces_from_net_dev(fake_proc):
+    fake_proc(network, {"/proc/net/dev": NET_DEV, "/proc/net/tcp": TCP})
+
+    interfaces = NetworkCollector().collect()["interfaces"]
+
+    assert set(interfaces) == {"lo", "eth0"}
+    assert interfaces["eth0"] == {
+        "bytes_sent": 7654321,
+        "bytes_sent_human": "7.30 MB",
+        "bytes_recv": 12345678,
+        "bytes_recv_human": "11.77 MB",
+        "packets_sent": 4000,
+        "packets_recv": 5000,
+        "errin": 1,
+        "errout": 3,
+        "dropin": 2,
+        "dropout": 4,
+    }
+
+
+def test_connection_states(fake_proc):
+    fake_proc(
+        network,
+        {
+            "/proc/net/dev": NET_DEV,
+            "/proc/net/tcp": TCP,
+            "/proc/net/tcp6": TCP6,
+            "/proc/net/udp": UDP,
+            "/proc/net/udp6": SOCKET_HEADER,
+        },
+    )
+
+    connections = NetworkCollector().collect()["connections"]
+
+    assert connections == {
+        "total": 6,
+        "established": 1,
+        "listen": 2,
+        "time_wait": 1,
+        "close_wait": 1,
+    }
+
+
+def test_missing_ipv6_tables_are_skipped(fake_proc):
+    fake_proc(network, {"/proc/net/dev": NET_DEV, "/proc/net/tcp": TCP, "/proc/net/udp": UDP})
+
+    connections = NetworkCollector().collect()["connections"]
+
+    assert connections["total"] == 5
+    assert connections["listen"] == 1
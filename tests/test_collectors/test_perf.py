@@ -0,0 +1,329 @@
+"""Tests for the perf script and perf report parsers."""
+
+import io
+import os
+import shlex
+
+import pytest
+
+from linux_profiler.collectors import perf
+from linux_profiler.collectors.perf import PerfCollector, _ProfileRun
+
+# `perf script -F comm,pid,time,ip,sym,dso` output: two samples, the second
+# one not followed by a blank line
+SCRIPT_OUTPUT = (
+    b"python 1234 100.000001:\n"
+    b"\t    7f0000001000 leaf_func (/usr/lib/libfoo.so)\n"
+    b"\t    7f0000002000 middle_func (/usr/lib/libfoo.so)\n"
+    b"\t    55d000003000 main (/usr/bin/python3.11)\n"
+    b"\n"
+    b"worker 99 100.010002:\n"
+    b"\t    7f0000001000 leaf_func (/usr/lib/libfoo.so)\n"
+    b"\t    55d000003000 main (/usr/bin/python3.11)\n"
+)
+
+# Default `perf script` layout, used when -F is not supported
+DEFAULT_SCRIPT_OUTPUT = (
+    b"python 1234 [003] 100.000001: cpu-clock:\n"
+    b"\t    ffffffff81000000 do_syscall_64 ([kernel.kallsyms])\n"
+    b"\t    7f0000004000 std::vector<int>::push_back (/usr/bin/app)\n"
+    b"\n"
+)
+
+REPORT_OUTPUT = b"""\
+# To display the perf.data header info, please use --header/--header-only options.
+#
+# Samples: 1K of event 'cpu-clock'
+# Event count (approx.): 250000000
+#
+# Overhead  Command  Symbol
+# ........  .......  ...........................
+#
+    45.20%  python   [.] _PyEval_EvalFrameDefault
+    12.00%  python   [k] __x86_indirect_thunk_rax
+     3.10%  worker   [.] std::map<int, int>::find
+"""
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    """A PerfCollector that does not look for a perf binary."""
+    monkeypatch.setattr(PerfCollector, "_check_perf_available", lambda self: False)
+    return PerfCollector()
+
+
+@pytest.fixture
+def fake_perf_script(tmp_path, monkeypatch):
+    """Put a fake perf on PATH whose `perf script` fails with ``stderr`` when given -F.
+
+    Without -F it prints SCRIPT_OUTPUT. Returns a function taking the
+    stderr text; the -F argument lists seen are recorded in ``calls``.
+    """
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (tmp_path / "sample.txt").write_bytes(SCRIPT_OUTPUT)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    def install(stderr: str) -> None:
+        perf = bin_dir / "perf"
+        perf.write_text(
+            "#!/bin/sh\n"
+            f'echo "$*" >> {shlex.quote(str(tmp_path / "calls"))}\n'
+            'case "$*" in *" -F "*)\n'
+            f"  echo {shlex.quote(stderr)} >&2; exit 1;;\n"
+            "esac\n"
+            f"cat {shlex.quote(str(tmp_path / 'sample.txt'))}\n"
+        )
+        perf.chmod(0o755)
+
+    return install
+
+
+def _script(collector, tmp_path):
+    samples: list = []
+    error = collector._script_samples(tmp_path / "perf.data", str(tmp_path), samples, bytearray())
+    calls = (tmp_path / "calls").read_text().splitlines()
+    return error, samples, calls
+
+
+def test_samples_are_parsed_leaf_first(collector):
+    samples = list(collector._iter_flame_graph_samples(io.BytesIO(SCRIPT_OUTPUT)))
+
+    assert samples == [
+        {
+            "command": "python",
+            "pid": 1234,
+            "timestamp": "100.000001:",
+            "stack": ["leaf_func", "middle_func", "main"],
+        },
+        {
+            "command": "worker",
+            "pid": 99,
+            "timestamp": "100.010002:",
+            "stack": ["leaf_func", "main"],
+        },
+    ]
+
+
+def test_symbols_are_shared_between_samples(collector):
+    first, second = collector._iter_flame_graph_samples(io.BytesIO(SCRIPT_OUTPUT))
+
+    assert first["stack"][0] is second["stack"][0]
+
+
+def test_default_script_layout(collector):
+    samples = list(collector._iter_flame_graph_samples(io.BytesIO(DEFAULT_SCRIPT_OUTPUT)))
+
+    assert samples == [
+        {
+            "command": "python",
+            "pid": 1234,
+            "timestamp": "100.000001:",
+            "stack": ["do_syscall_64", "std::vector<int>::push_back"],
+        }
+    ]
+
+
+def test_samples_without_frames_are_skipped(collector):
+    output = b"python 1234 100.000001:\n\n" + SCRIPT_OUTPUT
+
+    samples = list(collector._iter_flame_graph_samples(io.BytesIO(output)))
+
+    assert [sample["command"] for sample in samples] == ["python", "worker"]
+
+
+def test_write_collapsed_stacks_reverses_to_root_first(collector):
+    samples = collector._iter_flame_graph_samples(io.BytesIO(SCRIPT_OUTPUT))
+    out = io.StringIO()
+
+    written = PerfCollector.write_collapsed_stacks(samples, out)
+
+    assert written == 2
+    assert out.getvalue() == ("python;main;middle_func;leaf_func 1\n" "worker;main;leaf_func 1\n")
+
+
+def test_tee_head_copies_only_the_limit():
+    head = bytearray()
+    lines = list(PerfCollector._tee_head(io.BytesIO(SCRIPT_OUTPUT), head, 30))
+
+    assert b"".join(lines) == SCRIPT_OUTPUT
+    assert bytes(head) == SCRIPT_OUTPUT[:30]
+
+
+def test_extract_statistics(collector):
+    stats = collector._extract_statistics(REPORT_OUTPUT)
+
+    assert stats == {
+        "total_samples": 3,
+        "top_functions": [
+            {"overhead_percent": 45.2, "command": "python", "function": "_PyEval_EvalFrameDefault"},
+            {"overhead_percent": 12.0, "command": "python", "function": "__x86_indirect_thunk_rax"},
+            {"overhead_percent": 3.1, "command": "worker", "function": "std::map<int, int>::find"},
+        ],
+    }
+
+
+def test_extract_statistics_keeps_top_20(collector):
+    report = b"".join(b"    1.00%%  app  [.] func_%d\n" % i for i in range(25))
+
+    stats = collector._extract_statistics(report)
+
+    assert stats["total_samples"] == 20
+    assert stats["top_functions"][-1]["function"] == "func_19"
+
+
+def test_extract_statistics_of_empty_report(collector):
+    assert collector._extract_statistics(b"") == {"total_samples": 0, "top_functions": []}
+
+
+def test_extract_statistics_of_commands_with_spaces(collector):
+    report = (
+        b"    20.00%  Web Content      [.] js::RunScript\n"
+        b"     5.00%  kworker/0:1 H    [k] process_one_work\n"
+    )
+
+    stats = collector._extract_statistics(report)
+
+    assert stats["top_functions"] == [
+        {"overhead_percent": 20.0, "command": "Web Content", "function": "js::RunScript"},
+        {"overhead_percent": 5.0, "command": "kworker/0:1 H", "function": "process_one_work"},
+    ]
+
+
+def test_script_retries_without_fields_the_recording_lacks(collector, fake_perf_script, tmp_path):
+    fake_perf_script(
+        "Samples for 'cpu-clock' event do not have IP attribute set. Cannot print 'ip' field."
+    )
+
+    error, samples, calls = _script(collector, tmp_path)
+
+    assert error is None
+    assert len(samples) == 2
+    assert ["-F" in call.split() for call in calls] == [True, False]
+    # Only this recording lacked the fields; later ones still request them
+    assert collector._script_fields_supported
+
+
+def test_script_stops_requesting_fields_perf_does_not_know(collector, fake_perf_script, tmp_path):
+    fake_perf_script("  Error: unknown switch `F'")
+
+    error, samples, calls = _script(collector, tmp_path)
+
+    assert error is None
+    assert len(samples) == 2
+    assert not collector._script_fields_supported
+
+
+def test_script_failure_keeps_the_field_selection(collector, fake_perf_script, tmp_path):
+    fake_perf_script("WARNING: The perf.data file's data size field is 0 which is unexpected.")
+
+    error, samples, calls = _script(collector, tmp_path)
+
+    assert error["success"] is False
+    assert "data size field is 0" in error["error"]
+    assert len(calls) == 1
+    assert collector._script_fields_supported
+
+
+def _record_command(tmp_path, overwrite=False, low_overhead=True):
+    return PerfCollector._record_command(
+        _ProfileRun(str(tmp_path), None), 42, 5, 97, "cpu-clock", overwrite, None, low_overhead
+    )
+
+
+def _mmap_arg(command):
+    return command[command.index("-m") + 1] if "-m" in command else None
+
+
+@pytest.mark.parametrize(
+    "limit, expected",
+    [
+        (None, "16M"),  # privileged or perf_event_paranoid = -1
+        (64 << 20, "16M"),  # raised perf_event_mlock_kb
+        ((516 << 10) - 4096, None),  # default 516 kB limit: leave the size to perf
+    ],
+)
+def test_low_overhead_buffer_respects_mlock_limit(monkeypatch, tmp_path, limit, expected):
+    monkeypatch.setattr(perf, "_mlock_limit", lambda: limit)
+
+    command = _record_command(tmp_path)
+
+    assert _mmap_arg(command) == expected
+    assert "--no-buildid" in command
+
+
+def test_overwrite_buffer_respects_mlock_limit(monkeypatch, tmp_path):
+    monkeypatch.setattr(perf, "_mlock_limit", lambda: 1 << 20)
+
+    command = _record_command(tmp_path, overwrite=True)
+
+    assert "--overwrite" in command
+    assert _mmap_arg(command) is None
+
+
+def test_no_buffer_size_without_low_overhead(monkeypatch, tmp_path):
+    monkeypatch.setattr(perf, "_mlock_limit", lambda: None)
+
+    assert _mmap_arg(_record_command(tmp_path, low_overhead=False)) is None
+
+
+def _sysctls(tmp_path, paranoid, mlock_kb):
+    (tmp_path / "perf_event_paranoid").write_text(f"{paranoid}\n")
+    (tmp_path / "perf_event_mlock_kb").write_text(f"{mlock_kb}\n")
+    return str(tmp_path)
+
+
+def test_mlock_limit_for_unprivileged_users(monkeypatch, tmp_path):
+    monkeypatch.setattr(perf.os, "geteuid", lambda: 1000)
+
+    limit = perf._mlock_limit(_sysctls(tmp_path, 2, 516))
+
+    assert limit == 516 * 1024 - os.sysconf("SC_PAGE_SIZE")
+
+
+def test_mlock_limit_lifted(monkeypatch, tmp_path):
+    monkeypatch.setattr(perf.os, "geteuid", lambda: 1000)
+    assert perf._mlock_limit(_sysctls(tmp_path, -1, 516)) is None
+
+    monkeypatch.setattr(perf.os, "geteuid", lambda: 0)
+    assert perf._mlock_limit(_sysctls(tmp_path, 2, 516)) is None
+
+
+def test_mlock_limit_unknown(monkeypatch, tmp_path):
+    monkeypatch.setattr(perf.os, "geteuid", lambda: 1000)
+
+    assert perf._mlock_limit(str(tmp_path / "missing")) is None
+
+
+def test_prepare_profile_reads_the_command(collector):
+    collector._perf_available = True
+
+    error, frequency, command = collector._prepare_profile(os.getpid(), None, "light")
+
+    assert error is None
+    assert frequency == 47
+    assert command == open("/proc/self/comm").read().strip()
+
+
+def test_prepare_profile_of_a_missing_process(collector):
+    collector._perf_available = True
+
+    error, _frequency, _command = collector._prepare_profile(2**22 + 1, None, "normal")
+
+    assert error["error"] == f"Process with PID {2**22 + 1} does not exist"
+
+
+def test_prepare_profile_without_access(collector, monkeypatch):
+    collector._perf_available = True
+    real_open = os.open
+
+    def os_open(path, flags):
+        if path.endswith("/environ"):
+            raise PermissionError(path)
+        return real_open(path, flags)
+
+    monkeypatch.setattr(perf.os, "open", os_open)
+
+    error, _frequency, _command = collector._prepare_profile(os.getpid(), None, "normal")
+
+    assert error["error"] == f"Permission denied to access process {os.getpid()}"
@@ -0,0 +1,161 @@
+"""Tests for the process collector's top-N selection and process names."""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from linux_profiler.collectors import process, procfs
+from linux_profiler.collectors.process import ProcessCollector
+
+# (pid, rss bytes) of the fake processes, in /proc scan order; with a total
+# memory of 1000 bytes, memory percent is rss / 10
+PROCESSES = [(1, 100), (2, 300), (3, 100), (4, 50), (5, 300), (6, 10)]
+
+# CPU seconds each process uses between the two samples, one second apart
+CPU_USED = {1: 0.5, 2: 0.2, 3: 0.5, 4: 0.0, 5: 0.2, 6: 0.9}
+
+# Expected rankings: ties keep /proc scan order, as sorted()[:top_n] did
+CPU_ORDER = [6, 1, 3, 2, 5, 4]
+MEMORY_ORDER = [2, 5, 1, 3, 4, 6]
+
+
+def _rows(cpu_used):
+    return [
+        (
+            pid,
+            1000.0 + pid,
+            f"proc{pid}",
+            "root",
+            "sleeping",
+            10.0 + cpu_used.get(pid, 0.0),
+            rss,
+            rss * 4,
+            1,
+        )
+        for pid, rss in PROCESSES
+    ]
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    """A ProcessCollector over PROCESSES that has already taken its first sample."""
+    collector = ProcessCollector()
+    collector._total_memory = 1000
+    clock = iter([100.0, 101.0])
+    monkeypatch.setattr(process.time, "monotonic", lambda: next(clock))
+    samples = iter([_rows({}), _rows(CPU_USED)])
+    monkeypatch.setattr(collector, "_iter_procfs", lambda: iter(next(samples)))
+    monkeypatch.setattr(collector, "_iter_psutil", lambda: iter(next(samples)))
+    collector.collect()
+    return collector
+
+
+@pytest.mark.parametrize("top_n", [0, 3, 6, 10])
+def test_top_n_matches_a_full_sort(collector, top_n):
+    result = collector.collect(top_n=top_n)
+
+    assert [p["pid"] for p in result["top_cpu_consumers"]] == CPU_ORDER[:top_n]
+    assert [p["pid"] for p in result["top_memory_consumers"]] == MEMORY_ORDER[:top_n]
+    assert result["total_count"] == len(PROCESSES)
+    assert result["status_summary"] == {"sleeping": len(PROCESSES)}
+
+
+def test_top_n_defaults_to_the_constructor_value(collector):
+    collector.top_n = 2
+
+    result = collector.collect()
+
+    assert [p["pid"] for p in result["top_cpu_consumers"]] == [6, 1]
+    assert [p["pid"] for p in result["top_memory_consumers"]] == [2, 5]
+
+
+def test_record_fields(collector):
+    top = collector.collect(top_n=1)["top_cpu_consumers"][0]
+
+    assert top == {
+        "pid": 6,
+        "name": "proc6",
+        "username": "root",
+        "cpu_percent": 90.0,
+        "memory_percent": 1.0,
+        "memory_rss_bytes": 10,
+        "memory_rss_human": "10.00 B",
+        "memory_vms_bytes": 40,
+        "status": "sleeping",
+        "num_threads": 1,
+    }
+
+
+def test_first_sample_reports_no_cpu(monkeypatch):
+    collector = ProcessCollector()
+    collector._total_memory = 1000
+    monkeypatch.setattr(collector, "_iter_procfs", lambda: iter(_rows({})))
+    monkeypatch.setattr(collector, "_iter_psutil", lambda: iter(_rows({})))
+
+    result = collector.collect(top_n=3)
+
+    assert [p["cpu_percent"] for p in result["top_cpu_consumers"]] == [0.0, 0.0, 0.0]
+    # All tied, so the first processes scanned win
+    assert [p["pid"] for p in result["top_cpu_consumers"]] == [1, 2, 3]
+
+
+@pytest.fixture
+def long_named_process(tmp_path):
+    """A running process whose executable name is longer than 15 characters."""
+    sleep = shutil.which("sleep")
+    if sleep is None or not os.path.exists("/proc/self/stat"):
+        pytest.skip("needs /proc and a sleep binary")
+    executable = tmp_path / "a_very_long_process_name_here"
+    executable.symlink_to(sleep)
+    proc = subprocess.Popen([str(executable), "30"])
+    try:
+        yield proc.pid
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_long_names_are_expanded_from_cmdline(monkeypatch, long_named_process):
+    pid = long_named_process
+    # The kernel keeps the first 15 characters in /proc/<pid>/stat
+    comm = procfs.parse_pid_stat(procfs.read_proc_bytes(f"/proc/{pid}/stat"))[0].decode()
+    assert comm == "a_very_long_pro"
+    collector = ProcessCollector()
+    row = (pid, 1.0, comm, "root", "sleeping", 0.0, 1 << 20, 1 << 22, 1)
+    monkeypatch.setattr(collector, "_iter_procfs", lambda: iter([row]))
+
+    result = collector.collect(top_n=1)
+
+    assert result["top_cpu_consumers"][0]["name"] == "a_very_long_process_name_here"
+    assert result["top_memory_consumers"][0]["name"] == "a_very_long_process_name_here"
+    assert process.psutil.Process(pid).name() == "a_very_long_process_name_here"
+
+
+@pytest.mark.parametrize(
+    "cmdline, expected",
+    [
+        (b"/usr/libexec/gnome-keyring-daemon\0--start\0", "gnome-keyring-daemon"),
+        # Title rewritten with space-separated arguments
+        (b"gnome-keyring-daemon --start\0", "gnome-keyring-daemon"),
+        (b"gnome-keyring-daemon --start", "gnome-keyring-daemon"),
+        # argv[0] that does not extend the name is ignored
+        (b"/usr/bin/something-else\0", "gnome-keyring-d"),
+        # Kernel threads have an empty cmdline
+        (b"", "gnome-keyring-d"),
+    ],
+)
+def test_full_name_from_cmdline(monkeypatch, cmdline, expected):
+    monkeypatch.setattr(process, "read_proc_bytes", lambda path: cmdline)
+
+    assert ProcessCollector._procfs_full_name(1, "gnome-keyring-d") == expected
+
+
+def test_full_name_of_an_exited_process(monkeypatch):
+    def read_proc_bytes(path):
+        raise ProcessLookupError(path)
+
+    monkeypatch.setattr(process, "read_proc_bytes", read_proc_bytes)
+
+    assert ProcessCollector._procfs_full_name(1, "gnome-keyring-d") == "gnome-keyring-d"
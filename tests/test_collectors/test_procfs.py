@@ -0,0 +1,147 @@
+"""Tests for the /proc readers and parsers."""
+
+from linux_profiler.collectors import procfs
+
+PROC_STAT = b"""\
+cpu  100 5 50 800 50 1 2 3 4 0
+cpu0 50 5 25 400 25 1 2 3 4 0
+cpu1 50 0 25 400 25 0 0 0 0 0
+intr 12345 0 0
+ctxt 67890
+cpu_like_line_after_cpus 1 2 3
+"""
+
+MEMINFO = b"""\
+MemTotal:        8000000 kB
+MemFree:         1000000 kB
+HugePages_Total:       4
+Hugepagesize:       2048 kB
+"""
+
+
+def test_parse_cpu_times():
+    rows = procfs.parse_cpu_times(PROC_STAT)
+
+    assert rows == [
+        (100, 5, 50, 800, 50, 1, 2, 3, 4, 0),
+        (50, 5, 25, 400, 25, 1, 2, 3, 4, 0),
+        (50, 0, 25, 400, 25, 0, 0, 0, 0, 0),
+    ]
+
+
+def test_parse_cpu_times_pads_old_kernels():
+    # 2.6.11-era kernels report only up to steal
+    rows = procfs.parse_cpu_times(b"cpu  1 2 3 4 5 6 7 8\ncpu0 1 2 3 4 5 6 7 8\n")
+
+    assert rows[0] == (1, 2, 3, 4, 5, 6, 7, 8, 0, 0)
+    assert len(rows) == 2
+
+
+def test_parse_cpuinfo_mhz():
+    cpuinfo = (
+        b"processor\t: 0\nmodel name\t: Example CPU\ncpu MHz\t\t: 2100.000\n\n"
+        b"processor\t: 1\nmodel name\t: Example CPU\ncpu MHz\t\t: 1799.512\n\n"
+    )
+
+    assert procfs.parse_cpuinfo_mhz(cpuinfo) == [2100.0, 1799.512]
+
+
+def test_parse_cpuinfo_mhz_without_frequencies():
+    # e.g. arm64, which reports BogoMIPS but no clock speed
+    assert procfs.parse_cpuinfo_mhz(b"processor\t: 0\nBogoMIPS\t: 50.00\n") == []
+
+
+def test_parse_meminfo_converts_kb_to_bytes():
+    assert procfs.parse_meminfo(MEMINFO) == {
+        b"MemTotal": 8000000 * 1024,
+        b"MemFree": 1000000 * 1024,
+        b"HugePages_Total": 4,  # a count, not a size
+        b"Hugepagesize": 2048 * 1024,
+    }
+
+
+def test_parse_vmstat():
+    assert procfs.parse_vmstat(b"nr_free_pages 1000\npswpin 10\npswpout 20\n") == {
+        b"nr_free_pages": 1000,
+        b"pswpin": 10,
+        b"pswpout": 20,
+    }
+
+
+def test_parse_diskstats():
+    diskstats = (
+        b"   8       0 sda 100 10 2000 300 200 20 4000 500 0 600 800 0 0 0 0\n"
+        # Partition line of a 2.6 kernel: reads, read sectors, writes, write sectors
+        b"   8       1 sda1 50 1000 60 1200\n"
+    )
+
+    assert procfs.parse_diskstats(diskstats) == {
+        "sda": (100, 200, 2000 * 512, 4000 * 512, 300, 500, 600),
+        "sda1": (50, 60, 1000 * 512, 1200 * 512, 0, 0, 0),
+    }
+
+
+def test_parse_net_dev():
+    net_dev = b"""\
+Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:    1000      10    0    0    0     0          0         0     1000      10    0    0    0     0       0          0
+  eth0:12345678   5000    1    2    0     0          0         0  7654321    4000    3    4    0     0       0          0
+"""
+
+    assert procfs.parse_net_dev(net_dev) == {
+        "lo": (1000, 10, 0, 0, 1000, 10, 0, 0),
+        "eth0": (12345678, 5000, 1, 2, 7654321, 4000, 3, 4),
+    }
+
+
+def test_count_socket_states():
+    tcp = b"""\
+  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 00000000:0016 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1001 1 0 100 0 0 10 0
+   1: 0100007F:1F90 0100007F:C350 01 00000000:00000000 00:00000000 00000000  1000        0 1002 1 0 20 4 30 10 -1
+   2: 0100007F:1F90 0100007F:C351 01 00000000:00000000 00:00000000 00000000  1000        0 1003 1 0 20 4 30 10 -1
+   3: 0100007F:1F90 0100007F:C352 06 00000000:00000000 03:00000F9B 00000000     0        0 0 3 0
+"""
+
+    assert procfs.count_socket_states(tcp) == {b"0A": 1, b"01": 2, b"06": 1}
+
+
+def test_count_socket_states_of_empty_table():
+    header = b"  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt\n"
+
+    assert procfs.count_socket_states(header).total() == 0
+
+
+def test_parse_pid_stat_with_spaces_and_parens_in_comm():
+    stat = (
+        b"4242 (my (odd) proc) S 1 4242 4242 0 -1 4194560 100 0 0 0 "
+        b"150 25 0 0 20 0 3 0 98765 104857600 2560 18446744073709551615\n"
+    )
+
+    assert procfs.parse_pid_stat(stat) == (
+        b"my (odd) proc",
+        b"S",
+        150,
+        25,
+        3,
+        98765,
+        104857600,
+        2560,
+    )
+
+
+def test_proc_file_rereads_from_the_start(tmp_path):
+    path = tmp_path / "stat"
+    path.write_bytes(b"first")
+    proc_file = procfs.ProcFile(str(path))
+
+    assert proc_file.read() == b"first"
+    path.write_bytes(b"second, longer")
+    assert proc_file.read() == b"second, longer"
+    assert proc_file.read_small(6) == b"second"
+    proc_file.close()
+
+
+def test_open_proc_file_returns_none_when_missing(tmp_path):
+    assert procfs.open_proc_file(str(tmp_path / "missing")) is None
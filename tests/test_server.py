@@ -0,0 +1,143 @@
+"""Tests for the MCP server's tool handling and background refresh."""
+
+import asyncio
+import json
+import logging
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams
+
+from linux_profiler import server
+
+
+async def test_background_refresh_survives_collector_errors(monkeypatch, caplog):
+    calls = {"cpu": 0, "memory": 0}
+
+    def failing_refresh():
+        calls["cpu"] += 1
+        raise OSError("/proc/stat went away")
+
+    def memory_refresh():
+        calls["memory"] += 1
+        return {}
+
+    monkeypatch.setattr(server.cpu_collector, "refresh", failing_refresh)
+    monkeypatch.setattr(server.memory_collector, "refresh", memory_refresh)
+    monkeypatch.setattr(server.disk_collector, "refresh", dict)
+    monkeypatch.setattr(server.network_collector, "refresh", dict)
+
+    with caplog.at_level(logging.WARNING, logger=server.__name__):
+        async with server.background_refresh(0.01):
+            await asyncio.sleep(0.2)
+
+    # Both kept being refreshed, and leaving the context did not re-raise
+    assert calls["cpu"] >= 2
+    assert calls["memory"] >= 2
+    failures = [record for record in caplog.records if "CPUCollector" in record.getMessage()]
+    # The last refresh may be cancelled before its failure is logged
+    assert calls["cpu"] - 1 <= len(failures) <= calls["cpu"]
+    assert "/proc/stat went away" in str(failures[0].exc_info[1])
+
+
+async def test_background_refresh_disabled(monkeypatch):
+    def refresh():
+        raise AssertionError("refreshed with interval 0")
+
+    monkeypatch.setattr(server.cpu_collector, "refresh", refresh)
+
+    async with server.background_refresh(0):
+        await asyncio.sleep(0.05)
+
+
+async def _call_tool(name, arguments):
+    request = CallToolRequest(
+        method="tools/call", params=CallToolRequestParams(name=name, arguments=arguments)
+    )
+    result = await server.create_mcp_server().request_handlers[CallToolRequest](request)
+    return result.root
+
+
+@pytest.fixture
+def counted_collection(monkeypatch):
+    """Count collections behind the single-flight tools, each taking 50 ms."""
+    calls = []
+
+    async def collect_concurrently(collectors):
+        calls.append(sorted(collectors))
+        await asyncio.sleep(0.05)
+        return {name: collector.collect() for name, collector in collectors.items()}
+
+    monkeypatch.setattr(server, "collect_concurrently", collect_concurrently)
+    return calls
+
+
+@pytest.fixture(params=["fastjsonschema", "unvalidated"])
+def validation(request, monkeypatch):
+    """Run a test with the compiled validators, and again without them."""
+    if request.param == "unvalidated":
+        monkeypatch.setattr(server, "_VALIDATORS", {})
+    return request.param
+
+
+@pytest.mark.parametrize("extra", [[1], {"nested": True}])
+async def test_unhashable_undeclared_argument(counted_collection, validation, extra):
+    result = await _call_tool("get_all_metrics", {"include_processes": False, "extra": extra})
+
+    assert not result.isError
+    assert "system" in json.loads(result.content[0].text)
+
+
+async def test_unhashable_declared_argument_without_validation(monkeypatch, counted_collection):
+    monkeypatch.setattr(server, "_VALIDATORS", {})
+
+    results = await asyncio.gather(
+        _call_tool("get_all_metrics", {"include_processes": [False]}),
+        _call_tool("get_all_metrics", {"include_processes": [False]}),
+    )
+
+    # Answered, but each call runs on its own
+    assert all("processes" in json.loads(result.content[0].text) for result in results)
+    assert len(counted_collection) == 2
+
+
+async def test_identical_calls_are_coalesced(counted_collection):
+    results = await asyncio.gather(
+        _call_tool("get_performance_summary", {}),
+        _call_tool("get_performance_summary", {"extra": "ignored"}),
+        _call_tool("get_all_metrics", {"include_processes": False}),
+        _call_tool("get_all_metrics", {"include_processes": False, "extra": [1]}),
+    )
+
+    assert counted_collection == [
+        ["cpu", "disk", "memory"],
+        ["cpu", "disk", "memory", "network"],
+    ]
+    assert results[0].content[0].text == results[1].content[0].text
+    assert results[2].content[0].text == results[3].content[0].text
+
+
+@pytest.fixture(params=["fastjsonschema", "sdk"])
+def validating_server(request, monkeypatch):
+    """Validate arguments with the compiled validators, and again with the SDK's."""
+    if request.param == "sdk":
+        monkeypatch.setattr(server, "_VALIDATORS", {})
+        monkeypatch.setattr(server, "_CALL_TOOL_OPTIONS", {})
+    server.create_mcp_server.cache_clear()
+    yield request.param
+    server.create_mcp_server.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "name, arguments",
+    [
+        ("profile_process", {"pid": "1234"}),
+        ("profile_process", {"pid": 1234, "duration": 0}),
+        ("search_processes", {}),
+        ("get_all_metrics", {"encoding": "xml"}),
+    ],
+)
+async def test_invalid_arguments_are_errors(validating_server, name, arguments):
+    result = await _call_tool(name, arguments)
+
+    assert result.isError
+    assert "Input validation error" in result.content[0].text